@@ -4,7 +4,10 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 
 from api.sys_log import log_lifespan
+from api.board_events import board_events_lifespan
+from api.db.change_log import change_log_lifespan
 from api.db.database import database_lifespan
+from api.db.rank_rebalancer import rank_rebalancer_lifespan
 from api.db.redis_backend import redis_lifespan
 
 
@@ -13,5 +16,8 @@ async def master_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     async with AsyncExitStack() as stack:
         await stack.enter_async_context(log_lifespan(app))
         await stack.enter_async_context(database_lifespan(app))
+        await stack.enter_async_context(change_log_lifespan(app))
         await stack.enter_async_context(redis_lifespan(app))
+        await stack.enter_async_context(rank_rebalancer_lifespan(app))
+        await stack.enter_async_context(board_events_lifespan(app))
         yield
@@ -0,0 +1,244 @@
+import json
+import logging
+from typing import Callable, Iterable, List, Optional
+
+from redis import exceptions  # pyright: ignore[reportMissingImports]
+from api.config import settings
+from api.db import redis_backend
+
+logger = logging.getLogger("users_logger")
+
+BOARD_CACHE_TTL = settings.BOARD_CACHE_TTL
+PATCH_ATTEMPTS = 3
+
+# A snapshot is {"project_id": int | None, "columns": [{columnID, column_name,
+# tasks: [...]}, ...]} with the exact payload get_tasks_board returns.
+Snapshot = dict
+Patch = Callable[[Snapshot], bool]
+
+
+def snapshot_key(user_id: int, project_id: Optional[int]) -> str:
+    return f"board:{user_id}:{'all' if project_id is None else project_id}"
+
+
+def registry_key(user_id: int) -> str:
+    return f"board:{user_id}:snapshots"
+
+
+def generation_key(user_id: int) -> str:
+    return f"board:{user_id}:gen"
+
+
+def _sort_tasks(tasks: List[dict]) -> None:
+    # the same (rank_key, taskID) order as the board query, unkeyed cards first
+    tasks.sort(key=lambda task: (task.get("rank_key") is not None,
+                                 task.get("rank_key") or "", task.get("taskID") or 0))
+
+
+def _number_tasks(columns: List[dict]) -> List[dict]:
+    for column in columns:
+        for index, task in enumerate(column["tasks"]):
+            task["position"] = index
+    return columns
+
+
+def _find_task(snapshot: Snapshot, task_id: int):
+    for column in snapshot["columns"]:
+        for index, task in enumerate(column["tasks"]):
+            if task.get("taskID") == task_id:
+                return column, index
+    return None, None
+
+
+def in_scope(snapshot: Snapshot, project_id: Optional[int]) -> bool:
+    return snapshot.get("project_id") is None or snapshot.get("project_id") == project_id
+
+
+# -- patches: each one sets absolute values so applying it twice is harmless --
+
+def upsert_task(task: dict, column_id: int, column_name: str) -> Patch:
+    def patch(snapshot: Snapshot) -> bool:
+        if not in_scope(snapshot, task.get("projectID")):
+            return False
+
+        column, index = _find_task(snapshot, task["taskID"])
+        if column is not None:
+            column["tasks"].pop(index)
+
+        target = next((col for col in snapshot["columns"]
+                       if col["columnID"] == column_id), None)
+        if target is None:
+            target = {"columnID": column_id,
+                      "column_name": column_name, "tasks": []}
+            snapshot["columns"].append(target)
+            snapshot["columns"].sort(key=lambda col: col["columnID"])
+
+        target["tasks"].append(task)
+        _sort_tasks(target["tasks"])
+        return True
+    return patch
+
+
+def remove_task(task_id: int) -> Patch:
+    def patch(snapshot: Snapshot) -> bool:
+        column, index = _find_task(snapshot, task_id)
+        if column is None:
+            return False
+        column["tasks"].pop(index)
+        return True
+    return patch
+
+
+def update_task_fields(task_id: int, **fields) -> Patch:
+    def patch(snapshot: Snapshot) -> bool:
+        column, index = _find_task(snapshot, task_id)
+        if column is None:
+            return False
+        column["tasks"][index].update(fields)
+        return True
+    return patch
+
+
+def set_ranks(rows: Iterable[dict]) -> Patch:
+    """Moves every listed task to its (columnID, rank_key) as written to MySQL."""
+    rows = list(rows)
+
+    def patch(snapshot: Snapshot) -> bool:
+        changed = False
+        for row in rows:
+            column, index = _find_task(snapshot, row["taskID"])
+            if column is None:
+                continue
+            task = column["tasks"][index]
+            if column["columnID"] == row["columnID"] and task.get("rank_key") == row["rank_key"]:
+                continue
+
+            task["rank_key"] = row["rank_key"]
+            if column["columnID"] == row["columnID"]:
+                _sort_tasks(column["tasks"])
+            else:
+                column["tasks"].pop(index)
+                target = next((col for col in snapshot["columns"]
+                               if col["columnID"] == row["columnID"]), None)
+                if target is None:
+                    # snapshots carry every workflow column, so this one is
+                    # older than the column; the next read rebuilds it
+                    snapshot["stale"] = True
+                    return True
+                target["tasks"].append(task)
+                _sort_tasks(target["tasks"])
+            changed = True
+        return changed
+    return patch
+
+
+class BoardCache:
+    """
+    Per-user, per-project kanban board snapshots in Redis. Reads are served
+    straight from the snapshot; task mutations patch every snapshot of the
+    user in place instead of discarding it.
+    """
+
+    @property
+    def redis(self):
+        return redis_backend.redis_client
+
+    async def generation(self, user_id: int) -> int:
+        if self.redis is None:
+            return 0
+        try:
+            return int(await self.redis.get(generation_key(user_id)) or 0)
+        except exceptions.RedisError:
+            return 0
+
+    async def get(self, user_id: int, project_id: Optional[int]) -> Optional[List[dict]]:
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(snapshot_key(user_id, project_id))
+        except exceptions.RedisError as e:
+            logger.warning(f"Board cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        snapshot = json.loads(raw)
+        if snapshot.get("stale"):
+            return None
+        # positions are indexes in the column, renumbered after any patch
+        return _number_tasks(snapshot["columns"])
+
+    async def store(self, user_id: int, project_id: Optional[int],
+                    columns: List[dict], generation: int) -> None:
+        """
+        Saves a freshly built board unless a mutation patched the user's
+        boards since `generation` was read, which would make it stale.
+        """
+        if self.redis is None:
+            return
+        key = snapshot_key(user_id, project_id)
+        payload = json.dumps({"project_id": project_id, "columns": columns}, default=str)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(generation_key(user_id))
+                current = int(await pipe.get(generation_key(user_id)) or 0)
+                if current != generation:
+                    return
+                pipe.multi()
+                pipe.setex(key, BOARD_CACHE_TTL, payload)
+                pipe.sadd(registry_key(user_id), key)
+                pipe.expire(registry_key(user_id), BOARD_CACHE_TTL)
+                await pipe.execute()
+        except exceptions.WatchError:
+            logger.debug(f"Board snapshot {key} raced a mutation, not cached")
+        except exceptions.RedisError as e:
+            logger.warning(f"Board cache write failed: {e}")
+
+    async def apply(self, user_id: int, *patches: Patch) -> None:
+        """Applies `patches` to every cached board of the user."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.incr(generation_key(user_id))
+            keys = await self.redis.smembers(registry_key(user_id))
+            for key in keys:
+                await self._patch_snapshot(key, patches)
+        except exceptions.RedisError as e:
+            logger.warning(f"Board cache patch failed, dropping snapshots: {e}")
+            await self.invalidate(user_id)
+
+    async def _patch_snapshot(self, key: str, patches) -> None:
+        for _ in range(PATCH_ATTEMPTS):
+            try:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if raw is None:
+                        return
+                    snapshot = json.loads(raw)
+                    changed = [patch(snapshot) for patch in patches]
+                    if not any(changed):
+                        return
+                    pipe.multi()
+                    pipe.set(key, json.dumps(snapshot, default=str), keepttl=True)
+                    await pipe.execute()
+                    return
+            except exceptions.WatchError:
+                continue
+
+        # too much contention, let the next read rebuild it
+        await self.redis.delete(key)
+
+    async def invalidate(self, user_id: int) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.incr(generation_key(user_id))
+            keys = await self.redis.smembers(registry_key(user_id))
+            if keys:
+                await self.redis.delete(*keys)
+            await self.redis.delete(registry_key(user_id))
+        except exceptions.RedisError as e:
+            logger.error(f"Board cache invalidation failed: {e}")
+
+
+board_cache = BoardCache()
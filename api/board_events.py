@@ -0,0 +1,202 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+import json
+import logging
+from typing import AsyncGenerator, Dict, Optional, Set
+
+from fastapi import FastAPI, HTTPException, status
+from redis import exceptions  # pyright: ignore[reportMissingImports]
+from api.config import settings
+from api.db import redis_backend
+
+logger = logging.getLogger("users_logger")
+
+QUEUE_SIZE = settings.BOARD_EVENTS_QUEUE_SIZE
+MAX_EVENT_BYTES = settings.BOARD_EVENTS_MAX_EVENT_BYTES
+MAX_CONNECTIONS_PER_USER = settings.BOARD_EVENTS_MAX_CONNECTIONS_PER_USER
+HEARTBEAT_INTERVAL = settings.BOARD_EVENTS_HEARTBEAT_INTERVAL
+
+CHANNEL_PREFIX = "board_events"
+RECONNECT_DELAY = 1.0
+
+# sent instead of the backlog when a client falls behind or events may have
+# been lost; the client catches up through /tasks/changes
+RESYNC = json.dumps({"event": "resync"})
+
+
+def channel(user_id: int) -> str:
+    return f"{CHANNEL_PREFIX}:{user_id}"
+
+
+def change_event(project_id: Optional[int]) -> str:
+    return json.dumps({"event": "changed", "project_id": project_id})
+
+
+class BoardConnection:
+    """
+    One connected client. Its queue is bounded, so a client that stops
+    reading holds at most QUEUE_SIZE events of at most MAX_EVENT_BYTES.
+    """
+
+    def __init__(self, user_id: int) -> None:
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, event: str) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # the backlog is worthless to a client that has to resync anyway
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+
+
+class BoardEvents:
+    """
+    Fans board change events out to this instance's SSE clients. Mutations on
+    any instance publish to the user's Redis channel; a single pub/sub
+    connection per instance subscribes to the channels of users who have a
+    client connected here.
+    """
+
+    def __init__(self) -> None:
+        self._connections: Dict[int, Set[BoardConnection]] = {}
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.oversized = 0
+
+    async def connect(self, user_id: int) -> BoardConnection:
+        redis_client = redis_backend.redis_client
+        if redis_client is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Live board updates are unavailable, poll the board instead.")
+
+        connections = self._connections.setdefault(user_id, set())
+        if len(connections) >= MAX_CONNECTIONS_PER_USER:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many open board event streams for this user.")
+
+        connection = BoardConnection(user_id)
+        connections.add(connection)
+        if len(connections) == 1:
+            try:
+                await self._subscribe(redis_client, user_id)
+            except exceptions.RedisError as e:
+                await self.disconnect(connection)
+                logger.error(f"Board events subscribe failed: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Live board updates are unavailable, poll the board instead.")
+        return connection
+
+    async def disconnect(self, connection: BoardConnection) -> None:
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if connections:
+            return
+
+        del self._connections[connection.user_id]
+        if self._pubsub is not None:
+            with suppress(exceptions.RedisError):
+                await self._pubsub.unsubscribe(channel(connection.user_id))
+
+    async def _subscribe(self, redis_client, user_id: int) -> None:
+        if self._pubsub is None:
+            self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(channel(user_id))
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=HEARTBEAT_INTERVAL)
+                if message is not None:
+                    self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Board events subscriber lost: {e}")
+                if not await self._resubscribe():
+                    return
+
+    async def _resubscribe(self) -> bool:
+        """
+        Reconnects the subscriber and tells every client it may have missed
+        events. False when no client is left to resubscribe for.
+        """
+        old_pubsub, self._pubsub = self._pubsub, None
+        if old_pubsub is not None:
+            with suppress(Exception):
+                await old_pubsub.aclose()
+
+        for connections in self._connections.values():
+            for connection in connections:
+                connection.offer(RESYNC)
+
+        while self._connections:
+            await asyncio.sleep(RECONNECT_DELAY)
+            redis_client = redis_backend.redis_client
+            if redis_client is None:
+                continue
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(*[channel(user_id) for user_id in self._connections])
+                self._pubsub = pubsub
+                return True
+            except exceptions.RedisError as e:
+                logger.warning(f"Board events resubscribe failed: {e}")
+
+        # nobody left to serve, the next connect starts over
+        return False
+
+    def _dispatch(self, channel_name: str, data: str) -> None:
+        if len(data) > MAX_EVENT_BYTES:
+            self.oversized += 1
+            data = RESYNC
+
+        user_id = int(channel_name.rsplit(":", 1)[1])
+        for connection in self._connections.get(user_id, ()):
+            connection.offer(data)
+            self.delivered += 1
+
+    async def stop(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+        if self._pubsub is not None:
+            with suppress(Exception):
+                await self._pubsub.aclose()
+            self._pubsub = None
+
+    def snapshot(self) -> dict:
+        connections = [conn for conns in self._connections.values() for conn in conns]
+        return {
+            "users": len(self._connections),
+            "connections": len(connections),
+            "delivered": self.delivered,
+            "dropped": sum(conn.dropped for conn in connections),
+            "oversized": self.oversized,
+        }
+
+
+board_events = BoardEvents()
+
+
+@asynccontextmanager
+async def board_events_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await board_events.stop()
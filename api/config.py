@@ -1,4 +1,5 @@
 from datetime import timedelta
+from typing import Optional
 
 from pydantic_settings import BaseSettings  # type: ignore
 
@@ -20,6 +21,50 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_PORT: int
     AIVEN_CA_CERT_PATH: str
+    DB_POOL_MINSIZE: int = 5
+    DB_POOL_MAXSIZE: int = 10
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_ADAPTIVE: bool = False
+    DB_POOL_ADAPTIVE_MAXSIZE: int = 20
+    DB_POOL_ADAPTIVE_INTERVAL: int = 30
+    DB_POOL_GROW_WAIT_MS: float = 50.0
+    DB_POOL_SHRINK_WAIT_MS: float = 5.0
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[int] = None
+    DB_REPLICA_USER: Optional[str] = None
+    DB_REPLICA_PASSWORD: Optional[str] = None
+    READ_YOUR_WRITES_WINDOW: int = 5
+    DB_FANOUT_MAX_CONNECTIONS: int = 4
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    INTERNAL_API_TOKEN: Optional[str] = None
+    KANBAN_COLUMNS_TTL: int = 300
+    RECOMMENDATIONS_LOCAL_TTL: int = 60
+    RECOMMENDATIONS_REDIS_TTL: int = 3600
+    RECOMMENDATIONS_CACHE_ROWS: int = 500
+    BOARD_CACHE_TTL: int = 86400
+    CHANGE_LOG_RETENTION_DAYS: int = 30
+    CHANGE_LOG_COMPACT_INTERVAL: int = 3600
+    CHANGES_MAX_ENTRIES: int = 500
+    BOARD_EVENTS_QUEUE_SIZE: int = 32
+    BOARD_EVENTS_MAX_EVENT_BYTES: int = 1024
+    BOARD_EVENTS_MAX_CONNECTIONS_PER_USER: int = 10
+    BOARD_EVENTS_HEARTBEAT_INTERVAL: int = 15
+    RANK_KEY_REBALANCE_LENGTH: int = 16
+    RANK_REBALANCE_INTERVAL: int = 600
+    RANK_REBALANCE_BATCH: int = 50
+    IMPORT_CHUNK_ROWS: int = 500
+    IMPORT_MAX_ERRORS: int = 1000
+    IMPORT_MAX_LINE_BYTES: int = 65536
+    IMPORT_SPOOL_BYTES: int = 1048576
+    EXPORT_FETCH_ROWS: int = 500
+    DB_RETRY_ATTEMPTS: int = 3
+    DB_RETRY_BASE_DELAY: float = 0.05
+    DB_RETRY_MAX_DELAY: float = 1.0
+    DB_BREAKER_FAILURE_THRESHOLD: int = 5
+    DB_BREAKER_RESET_TIMEOUT: int = 30
+    DB_FANOUT_RESERVED_CONNECTIONS: int = 2
+    DB_HEALTH_CHECK_INTERVAL: int = 30
+    DB_HEALTH_CHECK_TIMEOUT: float = 5.0
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: str
     CLOUDINARY_API_SECRET:str
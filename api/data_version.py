@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import uuid
+from typing import Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from redis import exceptions  # pyright: ignore[reportMissingImports]
+from api.board_events import change_event, channel
+from api.db import redis_backend
+
+logger = logging.getLogger("users_logger")
+
+# hash fields next to the per-project counters
+ALL_PROJECTS = "all"
+EPOCH = "epoch"
+INCARNATION = "incarnation"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/")
+                  for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def normalized_query(request: Request) -> str:
+    """The query string with its parameters sorted, so their order doesn't change the ETag."""
+    return urlencode(sorted(request.query_params.multi_items()))
+
+
+def version_key(user_id: int) -> str:
+    return f"data_version:{user_id}"
+
+
+class DataVersion:
+    """
+    Per-user, per-project change counters in one Redis hash, used as ETags
+    for the board and list endpoints.
+
+    A mutation of a known project bumps that project and the "all projects"
+    counter. A mutation whose project isn't known (or that spans projects,
+    like a column renumber) bumps the epoch, which every scope includes.
+    The incarnation is a random id set when the hash is created, so a lost
+    hash can't hand out an ETag a client has already seen.
+    """
+
+    @property
+    def redis(self):
+        return redis_backend.redis_client
+
+    async def bump(self, user_id: int, project_id: Optional[int] = None) -> None:
+        if self.redis is None:
+            return
+        key = version_key(user_id)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hsetnx(key, INCARNATION, uuid.uuid4().hex)
+                if project_id is None:
+                    pipe.hincrby(key, EPOCH, 1)
+                else:
+                    pipe.hincrby(key, str(project_id), 1)
+                    pipe.hincrby(key, ALL_PROJECTS, 1)
+                # wakes the user's live board streams on every instance
+                pipe.publish(channel(user_id), change_event(project_id))
+                await pipe.execute()
+        except exceptions.RedisError as e:
+            # without the bump clients could keep a stale body, drop the hash
+            logger.error(f"Data version bump failed for user {user_id}: {e}")
+            try:
+                await self.redis.delete(key)
+            except exceptions.RedisError:
+                pass
+
+    async def etag(self, user_id: int, project_id: Optional[int], resource: str) -> Optional[str]:
+        """
+        ETag of `resource` for the given scope, None when Redis is unavailable.
+        Read it before building the response so a concurrent mutation makes the
+        ETag older than the body, never newer.
+        """
+        if self.redis is None:
+            return None
+        key = version_key(user_id)
+        scope = ALL_PROJECTS if project_id is None else str(project_id)
+        try:
+            await self.redis.hsetnx(key, INCARNATION, uuid.uuid4().hex)
+            incarnation, epoch, version = await self.redis.hmget(key, INCARNATION, EPOCH, scope)
+        except exceptions.RedisError as e:
+            logger.warning(f"Data version read failed for user {user_id}: {e}")
+            return None
+
+        raw = f"{resource}:{user_id}:{scope}:{incarnation}:{epoch or 0}:{version or 0}"
+        return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+    async def not_modified(self, request: Request, response: Response, user_id: int,
+                           project_id: Optional[int], resource: str,
+                           fresh: bool = True) -> Optional[Response]:
+        """
+        A 304 response when the client's If-None-Match is still current,
+        otherwise None after putting the ETag on `response`.
+
+        Pass fresh=False when the body will be read from a replica: it may
+        lag the version, so it goes out without an ETag a client could keep
+        revalidating a stale body with.
+        """
+        # filters, sorts and pages of the same resource are different bodies
+        etag = await self.etag(user_id, project_id,
+                               f"{resource}?{normalized_query(request)}")
+        if etag is None:
+            return None
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return Response(status_code=304, headers=headers)
+        if fresh:
+            response.headers.update(headers)
+        return None
+
+
+data_version = DataVersion()
@@ -0,0 +1,154 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+import logging
+from typing import AsyncGenerator, Dict, List, Optional, Sequence, Tuple
+
+from asyncmy.cursors import DictCursor  # type: ignore
+from fastapi import FastAPI
+from api.config import settings
+from api.db.database import DB_NAME, execute_batch, get_session_context
+from api.db.resilience import DB_ERRORS
+
+
+CHANGE_LOG_RETENTION_DAYS = settings.CHANGE_LOG_RETENTION_DAYS
+CHANGE_LOG_COMPACT_INTERVAL = settings.CHANGE_LOG_COMPACT_INTERVAL
+
+TASK = "task"
+SUBTASK = "subtask"
+PROJECT = "project"
+
+CREATE = "create"
+UPDATE = "update"
+REORDER = "reorder"
+DELETE = "delete"
+
+Statement = Tuple[str, Sequence]
+
+logger = logging.getLogger("users_logger")
+
+
+# The log keeps a single row per (user, entity, id) holding the sequence of its
+# latest change, so it never grows past the number of live entities plus
+# tombstones. Sequences come from one change_seq row per user: bumping it
+# row-locks it until commit, so a user's mutations commit in sequence order and
+# a client that saw sequence N can't later miss a change numbered below N.
+
+def next_sequence(user_id: int) -> List[Statement]:
+    """
+    Allocates the transaction's change sequence into @change_seq. Send it
+    first so every mutating transaction takes the row lock in the same order.
+    """
+    return [
+        (f"""INSERT INTO {DB_NAME}.change_seq (userID, seq) VALUES (%s, 1)
+             ON DUPLICATE KEY UPDATE seq = seq + 1""", (user_id,)),
+        (f"SET @change_seq = (SELECT seq FROM {DB_NAME}.change_seq WHERE userID = %s)",
+         (user_id,)),
+    ]
+
+
+def log_change(user_id: int, entity: str, op: str, entity_id: int,
+               project_id: Optional[int]) -> Statement:
+    return (f"""
+        INSERT INTO {DB_NAME}.change_log (userID, entity, entityID, projectID, op, seq)
+        VALUES (%s, %s, %s, %s, %s, @change_seq)
+        ON DUPLICATE KEY UPDATE seq = @change_seq, op = %s,
+            projectID = %s, changed_at = CURRENT_TIMESTAMP
+    """, (user_id, entity, entity_id, project_id, op, op, project_id))
+
+
+def log_changes_from(user_id: int, entity: str, op: str,
+                     select_stmt: str, params: Sequence) -> Statement:
+    """
+    Logs one change per row of `select_stmt`, which must return entityID and
+    projectID columns. For changes that touch a set of rows the handler
+    doesn't have ids for, like a column renumber.
+    """
+    return (f"""
+        INSERT INTO {DB_NAME}.change_log (userID, entity, entityID, projectID, op, seq)
+        SELECT %s, %s, src.entityID, src.projectID, %s, @change_seq
+        FROM ({select_stmt}) AS src
+        ON DUPLICATE KEY UPDATE seq = @change_seq, op = %s,
+            projectID = src.projectID, changed_at = CURRENT_TIMESTAMP
+    """, (user_id, entity, op, *params, op))
+
+
+async def read_changes(cursor, user_id: int, since: int, limit: int):
+    """
+    Change log entries after `since` (oldest first), the user's compaction
+    horizon and latest sequence. The entries are None when there are more
+    than `limit` of them.
+    """
+    result_sets = await execute_batch(cursor, [
+        (f"SELECT seq, compacted_through FROM {DB_NAME}.change_seq WHERE userID = %s",
+         (user_id,)),
+        (f"""SELECT entity, entityID, projectID, op, seq FROM {DB_NAME}.change_log
+             WHERE userID = %s AND seq > %s ORDER BY seq ASC LIMIT %s""",
+         (user_id, since, limit + 1)),
+    ])
+    seq_rows, entries = result_sets[0], result_sets[1]
+    latest = seq_rows[0]["seq"] if seq_rows else 0
+    horizon = seq_rows[0]["compacted_through"] if seq_rows else 0
+
+    if len(entries) > limit:
+        return None, horizon, latest
+    # entries are read after the counter, so they may run past it
+    latest = max([latest, *(entry["seq"] for entry in entries)])
+    return entries, horizon, latest
+
+
+async def compact_change_log() -> int:
+    """
+    Drops entries older than the retention window and moves each user's
+    horizon past them. Clients asking for changes below the horizon have
+    missed a tombstone and must resync in full.
+    """
+    async with get_session_context(route="change_log_compaction") as conn:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            try:
+                await execute_batch(cursor, [
+                    (f"""UPDATE {DB_NAME}.change_seq cs
+                         INNER JOIN (
+                             SELECT userID, MAX(seq) AS purged FROM {DB_NAME}.change_log
+                             WHERE changed_at < NOW() - INTERVAL %s DAY GROUP BY userID
+                         ) old ON old.userID = cs.userID
+                         SET cs.compacted_through = GREATEST(cs.compacted_through, old.purged)""",
+                     (CHANGE_LOG_RETENTION_DAYS,)),
+                    (f"""DELETE cl FROM {DB_NAME}.change_log cl
+                         INNER JOIN {DB_NAME}.change_seq cs ON cs.userID = cl.userID
+                         WHERE cl.seq <= cs.compacted_through""", ()),
+                ])
+                purged = cursor.rowcount
+                await conn.commit()
+                return purged
+            except DB_ERRORS:
+                await conn.rollback()
+                raise
+
+
+async def compaction_loop() -> None:
+    while True:
+        await asyncio.sleep(CHANGE_LOG_COMPACT_INTERVAL)
+        try:
+            purged = await compact_change_log()
+            if purged:
+                logger.info(f"Change log compaction purged {purged} entries.")
+        except Exception as e:
+            logger.error(f"Change log compaction failed: {e}")
+
+
+@asynccontextmanager
+async def change_log_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    task = asyncio.create_task(compaction_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+def group_entries(entries) -> Dict[str, List[int]]:
+    grouped: Dict[str, List[int]] = {TASK: [], SUBTASK: [], PROJECT: []}
+    for entry in entries:
+        grouped.setdefault(entry["entity"], []).append(entry["entityID"])
+    return grouped
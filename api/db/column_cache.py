@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from api.config import settings
+from api.db.database import DB_NAME
+
+
+KANBAN_COLUMNS_TTL = settings.KANBAN_COLUMNS_TTL
+
+logger = logging.getLogger("users_logger")
+
+
+class KanbanColumnsCache:
+    """
+    In-process copy of the kanban_columns workflow table. The table is static
+    configuration, so it is read at most once per TTL per instance; call
+    `invalidate()` after changing the workflow columns.
+    """
+
+    def __init__(self, ttl: int = KANBAN_COLUMNS_TTL) -> None:
+        self.ttl = ttl
+        self._columns: Optional[List[dict]] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._columns = None
+        self._expires_at = 0.0
+
+    def _fresh(self) -> bool:
+        return self._columns is not None and time.monotonic() < self._expires_at
+
+    async def get_columns(self, cursor) -> List[dict]:
+        if self._fresh():
+            assert self._columns is not None
+            return self._columns
+
+        # one refresh per expiry, concurrent requests wait for it
+        async with self._lock:
+            if not self._fresh():
+                await cursor.execute(
+                    f"SELECT columnID, column_name FROM {DB_NAME}.kanban_columns ORDER BY columnID ASC;")
+                rows = await cursor.fetchall()
+                self._columns = [dict(row) for row in rows]
+                self._expires_at = time.monotonic() + self.ttl
+                logger.debug(f"Refreshed {len(self._columns)} kanban columns")
+
+        assert self._columns is not None
+        return self._columns
+
+    async def get_names(self, cursor) -> Dict[int, str]:
+        return {col["columnID"]: col["column_name"]
+                for col in await self.get_columns(cursor)}
+
+
+kanban_columns = KanbanColumnsCache()
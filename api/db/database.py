@@ -1,11 +1,23 @@
+import asyncio
 from contextlib import asynccontextmanager
 import logging
 import os
-from typing import Any, AsyncGenerator
+import re
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from asyncmy.cursors import DictCursor  # type: ignore
+from asyncmy.connection import connect  # type: ignore
 from asyncmy.pool import create_pool  # type: ignore
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from api.config import settings
+from api.db import redis_backend
+from api.db.pool_health import (is_connection_lost, pool_health,
+                                start_health_checker, stop_health_checker)
+from api.db.pool_metrics import pool_metrics, start_pool_tuner, stop_pool_tuner
+from api.db.query_metrics import query_metrics
+from api.db.resilience import (CONNECTION_LOST, DEADLOCK, circuit_breaker,
+                               classify_error, is_retryable, wait_before_retry)
 import ssl
+import time
 
 
 DB_HOST = settings.DB_HOST
@@ -15,6 +27,14 @@ DB_PASSWORD = settings.DB_PASSWORD
 DB_PORT = settings.DB_PORT
 BUILD = settings.BUILD
 AIVEN_CA_PATH = settings.AIVEN_CA_CERT_PATH
+POOL_MINSIZE = settings.DB_POOL_MINSIZE
+POOL_MAXSIZE = settings.DB_POOL_MAXSIZE
+POOL_RECYCLE = settings.DB_POOL_RECYCLE
+POOL_ADAPTIVE = settings.DB_POOL_ADAPTIVE
+REPLICA_HOST = settings.DB_REPLICA_HOST
+READ_YOUR_WRITES_WINDOW = settings.READ_YOUR_WRITES_WINDOW
+FANOUT_MAX_CONNECTIONS = settings.DB_FANOUT_MAX_CONNECTIONS
+FANOUT_RESERVED_CONNECTIONS = settings.DB_FANOUT_RESERVED_CONNECTIONS
 
 mySqlConf = {
     "host": DB_HOST,
@@ -23,17 +43,74 @@ mySqlConf = {
     "password": DB_PASSWORD,
     'port': DB_PORT
 }
+replicaSqlConf = {
+    **mySqlConf,
+    "host": REPLICA_HOST,
+    "user": settings.DB_REPLICA_USER or DB_USER,
+    "password": settings.DB_REPLICA_PASSWORD or DB_PASSWORD,
+    'port': settings.DB_REPLICA_PORT or DB_PORT
+}
 logger = logging.getLogger("users_logger")
 db_pool = None
+replica_pool = None
+
+# username -> monotonic time of the last commit made by this instance,
+# ordered oldest first
+recent_writes: Dict[str, float] = {}
 
 IS_LOCAL = BUILD == 'development'
 
+T = TypeVar("T")
+
+
+class SessionReusingSSLContext(ssl.SSLContext):
+    """
+    Client SSL context that offers the last TLS session it saw to every new
+    connection, so pool connections after the first resume the session with
+    an abbreviated handshake instead of a full one.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self._last_object: Optional[ssl.SSLObject] = None
+        self.tls_session: Optional[ssl.SSLSession] = None
+        self.handshakes = 0
+        self.resumed = 0
+
+    def _harvest_session(self) -> None:
+        # TLS 1.3 tickets arrive after the handshake, so the session of the
+        # previous connection is only read once the next one is opened
+        last, self._last_object = self._last_object, None
+        if last is None:
+            return
+        try:
+            if last.session_reused:
+                self.resumed += 1
+            if last.session is not None:
+                self.tls_session = last.session
+        except (ValueError, ssl.SSLError):
+            pass
+
+    def wrap_bio(self, incoming, outgoing, server_side=False,
+                 server_hostname=None, session=None):
+        self._harvest_session()
+        ssl_object = super().wrap_bio(incoming, outgoing, server_side=server_side,
+                                      server_hostname=server_hostname,
+                                      session=session or self.tls_session)
+        self._last_object = ssl_object
+        self.handshakes += 1
+        return ssl_object
+
+    def stats(self) -> dict:
+        self._harvest_session()
+        return {"handshakes": self.handshakes, "resumed": self.resumed}
+
 
 async def get_ssl_context():
     if IS_LOCAL:
         return None
 
-    ssl_ctx = ssl.create_default_context()
+    ssl_ctx = SessionReusingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
 
     if AIVEN_CA_PATH and os.path.exists(AIVEN_CA_PATH):
         try:
@@ -43,6 +120,7 @@ async def get_ssl_context():
             logger.error(f"Failed to load custom CA file: {e}")
             raise
     else:
+        ssl_ctx.load_default_certs(ssl.Purpose.SERVER_AUTH)
         # Allows connection encryption without failing if certificate path isn't present
         logger.warning(
             f"CA file not found at '{AIVEN_CA_PATH}'. Falling back to default TLS verification."
@@ -53,46 +131,594 @@ async def get_ssl_context():
     return ssl_ctx
 
 
+async def prewarm_pool(pool, size: int, name: str = "Database") -> None:
+    """
+    Opens `size` connections before the app starts serving. The first one
+    pays the full TLS handshake; the rest open concurrently and resume its
+    session.
+    """
+    started = time.perf_counter()
+
+    async def open_connection():
+        return await connect(**pool._conn_kwargs)
+
+    opened = []
+    if size > 0:
+        try:
+            opened.append(await open_connection())
+        except Exception as e:
+            logger.error(f"{name} pool warm-up failed: {e}")
+
+    if opened and size > 1:
+        results = await asyncio.gather(*(open_connection() for _ in range(size - 1)),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"{name} pool warm-up connection failed: {result}")
+            else:
+                opened.append(result)
+
+    async with pool.cond:
+        pool._free.extend(opened)
+        pool._minsize = size
+        pool.cond.notify_all()
+
+    ssl_ctx = pool._conn_kwargs.get("ssl")
+    tls_stats = ssl_ctx.stats() if isinstance(ssl_ctx, SessionReusingSSLContext) else {}
+    logger.info(
+        f"{name} pool warmed with {len(opened)}/{size} connections in "
+        f"{(time.perf_counter() - started) * 1000:.0f}ms {tls_stats}")
+
+
 @asynccontextmanager
 async def database_lifespan(_: FastAPI):
-    global db_pool
+    global db_pool, replica_pool
+    health_task = None
+    replica_health_task = None
+    tuner_task = None
     try:
         ssl_context = await get_ssl_context()
-        db_pool = await create_pool(**mySqlConf, minsize=5, maxsize=10,
-                                    pool_recycle=300,
+        # minsize is applied by prewarm_pool so connections open concurrently
+        db_pool = await create_pool(**mySqlConf, minsize=0,
+                                    maxsize=POOL_MAXSIZE,
+                                    pool_recycle=POOL_RECYCLE,
                                     ssl=ssl_context)
+        await prewarm_pool(db_pool, POOL_MINSIZE)
+
+        logger.info(
+            f"Database connection pool created ({POOL_MINSIZE}-{POOL_MAXSIZE}).")
+        health_task = start_health_checker(db_pool)
+        if POOL_ADAPTIVE:
+            tuner_task = start_pool_tuner(db_pool)
 
-        logger.info("Database connection pool created.")
+        if REPLICA_HOST:
+            replica_pool = await create_pool(**replicaSqlConf, minsize=0,
+                                             maxsize=POOL_MAXSIZE,
+                                             pool_recycle=POOL_RECYCLE,
+                                             ssl=await get_ssl_context())
+            await prewarm_pool(replica_pool, POOL_MINSIZE, name="Read replica")
+            logger.info(f"Read replica pool created for {REPLICA_HOST}.")
+            replica_health_task = start_health_checker(replica_pool, name="Read replica")
         yield
 
     finally:
+        await stop_pool_tuner(tuner_task)
+        await stop_health_checker(health_task)
+        await stop_health_checker(replica_health_task)
+        if replica_pool:
+            replica_pool.close()
+            await replica_pool.wait_closed()
+            logger.info("Read replica pool closed.")
         if db_pool:
             db_pool.close()
             await db_pool.wait_closed()
             logger.info("Database connection pool closed.")
 
 
-async def get_session() -> AsyncGenerator[Any, None]:
+class LazySession:
     """
-    Use inside FastAPI route signatures:
-    conn: Connection = Depends(get_session)
+    Stand-in for an asyncmy Connection that only checks one out of `db_pool`
+    the first time a cursor is opened. Requests that never query MySQL
+    (cache hits, access-token checks) never occupy a pool slot.
+
+    Idle connections are validated by the background health checker, so no
+    ping is sent on checkout. A connection found dead on its first statement
+    is evicted and the statement retried on a fresh one. While the circuit
+    breaker is open no connection is checked out at all.
     """
-    if db_pool is None:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database connection pool not initialized.",
-        )
 
-    async with db_pool.acquire() as conn:
+    def __init__(self, pool, route: str = "background",
+                 writer: Optional[str] = None,
+                 request_id: Optional[str] = None) -> None:
+        self._pool = pool
+        self._conn = None
+        self._route = route
+        self._writer = writer
+        self._request_id = request_id
+        self._checked_out_at = 0.0
+        # nothing has run since checkout/commit, so a retry can't lose work
+        self._pristine = True
+
+    @property
+    def pool(self):
+        return self._pool
+
+    @property
+    def route(self) -> str:
+        return self._route
+
+    @property
+    def request_id(self) -> Optional[str]:
+        return self._request_id
+
+    @property
+    def acquired(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def can_retry(self) -> bool:
+        return self._pristine
+
+    @property
+    def on_replica(self) -> bool:
+        """True when reads may lag the primary."""
+        return replica_pool is not None and self._pool is replica_pool
+
+    async def connection(self):
+        if self._conn is None:
+            circuit_breaker.before_call()
+            started = time.perf_counter()
+            try:
+                self._conn = await self._pool.acquire()
+            except Exception as e:
+                if classify_error(e) == CONNECTION_LOST:
+                    circuit_breaker.record_failure()
+                raise
+            self._checked_out_at = time.perf_counter()
+            pool_metrics.record_acquire(
+                (self._checked_out_at - started) * 1000)
+            self._pristine = True
+        return self._conn
+
+    def _return_to_pool(self, conn):
+        pool_metrics.record_checkout(
+            self._route, (time.perf_counter() - self._checked_out_at) * 1000)
+        return self._pool.release(conn)
+
+    async def reconnect(self):
+        """Evicts the current (broken) connection and checks out a fresh one."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.close()
+            await self._return_to_pool(conn)
+            pool_health.evictions += 1
+
         try:
-            await conn.ping(reconnect=True)
+            conn = await self.connection()
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error(f"Database reconnect failed: {e}")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Database connection unavailable.",
             ) from e
-        yield conn
+
+        pool_health.reconnects += 1
+        return conn
+
+    def mark_used(self):
+        self._pristine = False
+
+    def observe(self, method: str, statement: str, elapsed_ms: float,
+                rows: int, failed: bool = False):
+        query_metrics.observe(method, statement, elapsed_ms, rows,
+                              route=self._route, request_id=self._request_id,
+                              failed=failed)
+
+    def cursor(self, cursor=None):
+        return _LazyCursorContext(self, cursor)
+
+    async def commit(self):
+        if self._conn is not None:
+            await self._conn.commit()
+            self._pristine = True
+            if self._writer:
+                await mark_recent_write(self._writer)
+
+    async def rollback(self):
+        if self._conn is not None:
+            await self._conn.rollback()
+            self._pristine = True
+
+    async def release(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            # even plain reads leave a transaction open, and the pool closes
+            # connections handed back in one
+            if conn.get_transaction_status():
+                try:
+                    await conn.rollback()
+                except Exception as e:
+                    logger.warning(f"Rollback before release failed: {e}")
+                    conn.close()
+                    pool_health.evictions += 1
+            await self._return_to_pool(conn)
+
+
+_CALL_STATEMENT = re.compile(r"\s*CALL\s+`?(\w+)", re.IGNORECASE)
+
+
+def _batched_statement(query: str) -> Tuple[str, str]:
+    """The (method, statement) a statement of a batch is keyed by in the query metrics."""
+    match = _CALL_STATEMENT.match(query)
+    if match:
+        return "callproc", match.group(1)
+    return "execute", query
+
+
+class SessionCursor:
+    """
+    Wraps a driver cursor so transient failures (lost connections, deadlocks,
+    lock wait timeouts) are retried with backoff where that is safe, and
+    every execute/callproc is timed into the query metrics.
+    """
+
+    def __init__(self, session: LazySession, cursor, cursor_cls) -> None:
+        self._session = session
+        self._cursor = cursor
+        self._cursor_cls = cursor_cls
+        self._failed_statement = 0
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    @property
+    def pool(self):
+        return self._session.pool
+
+    @property
+    def session(self) -> LazySession:
+        return self._session
+
+    async def execute(self, query, args=None):
+        return await self._run("execute", query, args)
+
+    async def callproc(self, procname, args=()):
+        return await self._run("callproc", procname, args)
+
+    async def _run(self, method: str, *args):
+        started = time.perf_counter()
+        try:
+            result = await self._call(method, *args)
+
+        except Exception:
+            self._session.observe(method, args[0],
+                                  (time.perf_counter() - started) * 1000,
+                                  rows=0, failed=True)
+            raise
+
+        self._session.observe(method, args[0],
+                              (time.perf_counter() - started) * 1000,
+                              rows=self._cursor.rowcount)
+        return result
+
+    async def execute_batch(self, statements: Sequence[Tuple[str, Any]]) -> List[list]:
+        """
+        Runs `statements` in one round trip. A failure in any of them is
+        classified like a single statement; once an earlier statement of the
+        batch has run, the batch is only replayed (after a rollback) when it
+        opened the transaction.
+        """
+        attempt = 1
+        while True:
+            pristine = self._session.can_retry
+            try:
+                result_sets = await self._run_batch(statements)
+
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == CONNECTION_LOST:
+                    circuit_breaker.record_failure()
+                ran_earlier = self._failed_statement > 0
+                if (ran_earlier and not pristine) or not is_retryable(kind, attempt, pristine):
+                    raise
+
+                await wait_before_retry(kind, attempt, e)
+                attempt += 1
+
+                if kind == CONNECTION_LOST:
+                    conn = await self._session.reconnect()
+                    self._cursor = conn.cursor(self._cursor_cls)
+                elif kind == DEADLOCK or ran_earlier:
+                    await self._session.rollback()
+                continue
+
+            circuit_breaker.record_success()
+            self._session.mark_used()
+            return result_sets
+
+    async def _run_batch(self, statements: Sequence[Tuple[str, Any]]) -> List[list]:
+        """
+        MySQL answers a multi-statement query one statement at a time, so the
+        wait for each result (the first execute, then every nextset) is that
+        statement's own latency and is observed under its own key. A CALL
+        answers with its procedure's result sets and then a status result.
+        """
+        cursor = self._cursor
+        batch = ";\n".join(cursor.mogrify(query, args) for query, args in statements)
+        result_sets = []
+        index, rows = 0, 0
+        started = time.perf_counter()
+        try:
+            await cursor.execute(batch)
+            while True:
+                has_rows = bool(cursor.description)
+                if has_rows:
+                    result = await cursor.fetchall()
+                    result_sets.append(result)
+                    rows += len(result)
+                else:
+                    rows += max(cursor.rowcount, 0)
+
+                query = statements[min(index, len(statements) - 1)][0]
+                if not (has_rows and _CALL_STATEMENT.match(query)):
+                    now = time.perf_counter()
+                    self._session.observe(*_batched_statement(query),
+                                          (now - started) * 1000, rows)
+                    index, rows, started = index + 1, 0, now
+
+                if not await cursor.nextset():
+                    break
+
+        except Exception:
+            self._failed_statement = index
+            query = statements[min(index, len(statements) - 1)][0]
+            self._session.observe(*_batched_statement(query),
+                                  (time.perf_counter() - started) * 1000,
+                                  rows=0, failed=True)
+            raise
+
+        return result_sets
+
+    async def _call(self, method: str, *args):
+        attempt = 1
+        while True:
+            try:
+                result = await getattr(self._cursor, method)(*args)
+
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == CONNECTION_LOST:
+                    circuit_breaker.record_failure()
+                if not is_retryable(kind, attempt, self._session.can_retry):
+                    raise
+
+                await wait_before_retry(kind, attempt, e)
+                attempt += 1
+
+                if kind == CONNECTION_LOST:
+                    conn = await self._session.reconnect()
+                    self._cursor = conn.cursor(self._cursor_cls)
+                elif kind == DEADLOCK:
+                    # InnoDB already rolled the transaction back
+                    await self._session.rollback()
+                continue
+
+            circuit_breaker.record_success()
+            self._session.mark_used()
+            return result
+
+    async def close(self):
+        await self._cursor.close()
+
+
+class _LazyCursorContext:
+    def __init__(self, session: LazySession, cursor_cls) -> None:
+        self._session = session
+        self._cursor_cls = cursor_cls
+        self._cursor: Optional[SessionCursor] = None
+
+    async def __aenter__(self):
+        conn = await self._session.connection()
+        self._cursor = SessionCursor(
+            self._session, conn.cursor(self._cursor_cls), self._cursor_cls)
+        return self._cursor
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        assert self._cursor is not None
+        await self._cursor.close()
+
+
+async def mark_recent_write(username: str) -> None:
+    """Pins `username` to the primary for the read-your-writes window."""
+    if replica_pool is None:
+        return
+
+    # moved to the end so the dict stays ordered by write time
+    recent_writes.pop(username, None)
+    recent_writes[username] = time.monotonic()
+    if redis_backend.redis_client is None:
+        return
+    try:
+        await redis_backend.redis_client.setex(
+            f"user:{username}:recent_write", READ_YOUR_WRITES_WINDOW, 1)
+    except Exception as e:
+        logger.warning(f"Failed to record recent write for {username}: {e}")
+
+
+def prune_recent_writes() -> None:
+    """Drops the writes whose read-your-writes window has passed."""
+    cutoff = time.monotonic() - READ_YOUR_WRITES_WINDOW
+    while recent_writes:
+        username = next(iter(recent_writes))
+        if recent_writes[username] > cutoff:
+            break
+        del recent_writes[username]
+
+
+async def wrote_recently(username: str) -> bool:
+    prune_recent_writes()
+    if username in recent_writes:
+        return True
+
+    # writes made through another instance
+    if redis_backend.redis_client is None:
+        return False
+    try:
+        return bool(await redis_backend.redis_client.exists(f"user:{username}:recent_write"))
+    except Exception:
+        # can't prove the replica is safe to read from
+        return True
+
+
+def request_route_name(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {getattr(route, 'path', request.url.path)}"
+
+
+def request_id(request: Request) -> Optional[str]:
+    return getattr(request.state, "req_id", None)
+
+
+async def open_session(route: str = "background", pool=None,
+                       writer: Optional[str] = None,
+                       request_id: Optional[str] = None) -> AsyncGenerator[Any, None]:
+    pool = pool or db_pool
+    if pool is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection pool not initialized.",
+        )
+
+    session = LazySession(pool, route=route, writer=writer,
+                          request_id=request_id)
+    try:
+        yield session
+    finally:
+        await session.release()
+
 
 # background task database conn context
-get_session_context = asynccontextmanager(get_session)
+get_session_context = asynccontextmanager(open_session)
+
+
+@asynccontextmanager
+async def primary_session(session: LazySession, needed: bool = True):
+    """
+    `session` itself, or a session on the primary for the block when
+    `session` reads from the replica and `needed` is set.
+    """
+    if not (needed and session.on_replica):
+        yield session
+        return
+    async with get_session_context(route=session.route,
+                                   request_id=session.request_id) as primary:
+        yield primary
+
+
+async def get_session(request: Request) -> AsyncGenerator[Any, None]:
+    """
+    Use inside FastAPI route signatures:
+    conn: Connection = Depends(get_session)
+
+    The connection is acquired lazily on first cursor use and released
+    once the request is done.
+    """
+    async with get_session_context(route=request_route_name(request),
+                                   writer=request.path_params.get("username"),
+                                   request_id=request_id(request)) as session:
+        yield session
+
+
+async def read_pool(username: Optional[str]):
+    """The replica pool, or the primary while `username` may read its own writes."""
+    if replica_pool is not None and username and await wrote_recently(username):
+        return db_pool
+    return replica_pool
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[Any, None]:
+    """
+    Session for read-only handlers. Served by the replica pool when one is
+    configured, unless the user committed a write within the last
+    READ_YOUR_WRITES_WINDOW seconds and the replica may still lag behind.
+    """
+    pool = await read_pool(request.path_params.get("username"))
+    async with get_session_context(route=request_route_name(request), pool=pool,
+                                   request_id=request_id(request)) as session:
+        yield session
+
+
+async def execute_batch(cursor, statements: Sequence[Tuple[str, Sequence]]) -> List[list]:
+    """
+    Sends several parameterised statements to MySQL in one round trip and
+    returns the rows of every result set they produced, in order. Statements
+    that only return a status (UPDATE, the trailing status of a CALL) are
+    skipped.
+    """
+    if isinstance(cursor, SessionCursor):
+        return await cursor.execute_batch(statements)
+
+    batch = ";\n".join(cursor.mogrify(query, args) for query, args in statements)
+    await cursor.execute(batch)
+
+    result_sets = []
+    while True:
+        if cursor.description:
+            result_sets.append(await cursor.fetchall())
+        if not await cursor.nextset():
+            break
+    return result_sets
+
+
+def pool_headroom(pool=None) -> int:
+    """Connections that can be checked out right now without waiting."""
+    pool = pool or db_pool
+    if pool is None:
+        return 0
+    return pool.freesize + (pool.maxsize - pool.size)
+
+
+async def gather_on_pool(
+    jobs: Sequence[Callable[[DictCursor], Awaitable[T]]],
+    fallback_cursor: DictCursor,
+    max_connections: int = FANOUT_MAX_CONNECTIONS,
+) -> List[T]:
+    """
+    Runs independent read jobs concurrently on up to `max_connections` extra
+    pool connections and returns their results in job order.
+
+    Falls back to running the jobs one after another on `fallback_cursor`
+    (the request's own connection) when the pool cannot spare at least two
+    connections beyond the reserved ones, so a busy pool is never drained
+    by a single request. Jobs run against the same pool as that cursor, each
+    worker in its own session so checkouts go through the circuit breaker,
+    statements are retried and timed like the request's own, and the
+    connection is rolled back before it goes back to the pool.
+    """
+    parent = getattr(fallback_cursor, "session", None)
+    pool = getattr(fallback_cursor, "pool", None) or db_pool
+    available = pool_headroom(pool) - FANOUT_RESERVED_CONNECTIONS
+    workers = min(max_connections, len(jobs), available)
+
+    if workers < 2:
+        logger.debug(
+            f"Pool under pressure (headroom {pool_headroom(pool)}), running {len(jobs)} jobs serially")
+        return [await job(fallback_cursor) for job in jobs]
+
+    assert pool is not None
+    results: List[Any] = [None] * len(jobs)
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, job in enumerate(jobs):
+        queue.put_nowait((index, job))
+
+    async def worker():
+        async with get_session_context(
+                route=parent.route if parent else "background", pool=pool,
+                request_id=parent.request_id if parent else None) as session:
+            async with session.cursor(cursor=DictCursor) as cursor:
+                while not queue.empty():
+                    index, job = queue.get_nowait()
+                    results[index] = await job(cursor)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import date, timedelta
+from itertools import product
+import sys
+from typing import Iterator, List, Optional
+
+from asyncmy.connection import connect  # type: ignore
+from asyncmy.cursors import DictCursor  # type: ignore
+from api.db.database import get_ssl_context, mySqlConf
+from api.db.task_queries import LIST_SORTS, column_page_statements
+from api.models.entities import TaskListFilters
+
+
+# joined lookup tables of a handful of rows, scanning them is expected
+LOOKUP_TABLES = {"kc", "pr"}
+
+
+def filter_combinations(tag: str = "plan-check") -> Iterator[TaskListFilters]:
+    """Every combination of the /tasks/list filters, with every sort."""
+    today = date.today()
+    for due, priority, with_tag, completed, overdue, sort, order in product(
+            (False, True), (False, True), (False, True), (None, True, False),
+            (None, True, False), LIST_SORTS, ("asc", "desc")):
+        if sort == "position" and order == "desc":
+            continue
+        yield TaskListFilters(
+            due_from=today if due else None,
+            due_to=today + timedelta(days=7) if due else None,
+            priority=[1, 2] if priority else [],
+            tag=tag if with_tag else None,
+            completed=completed, overdue=overdue, sort=sort, order=order)
+
+
+def full_scans(plan: List[dict]) -> List[dict]:
+    """EXPLAIN rows that read a whole table (or a whole index) of data."""
+    return [row for row in plan
+            if row.get("table") not in LOOKUP_TABLES
+            and (row.get("type") in ("ALL", "index") or
+                 (row.get("table") == "t" and row.get("key") is None))]
+
+
+async def check_filter_plans(cursor, user_id: int, column_id: int,
+                             project_id: Optional[int] = None) -> List[dict]:
+    """
+    EXPLAINs the page and count query of every filter combination for one
+    column and returns the ones whose plan falls back to a full scan.
+    """
+    failures = []
+    for filters in filter_combinations():
+        for query, params in column_page_statements(user_id, project_id, column_id,
+                                                     size=10, offset=0, filters=filters):
+            await cursor.execute("EXPLAIN " + query, params)
+            scans = full_scans(await cursor.fetchall())
+            if scans:
+                failures.append({"filters": filters.model_dump(exclude_defaults=True),
+                                 "project_id": project_id, "scans": scans})
+    return failures
+
+
+async def main(user_id: int, column_id: int) -> int:
+    conn = await connect(**mySqlConf, ssl=await get_ssl_context())
+    try:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            failures = []
+            for project_id in (None, 1):
+                failures += await check_filter_plans(cursor, user_id, column_id, project_id)
+    finally:
+        conn.close()
+
+    for failure in failures:
+        print(f"full scan for {failure['filters']} (project {failure['project_id']}):")
+        for row in failure["scans"]:
+            print(f"    table={row.get('table')} type={row.get('type')} "
+                  f"key={row.get('key')} rows={row.get('rows')}")
+    print(f"{len(failures)} of the filter plans fall back to a full scan.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m api.db.filter_plans <userID> <columnID>")
+        sys.exit(2)
+    sys.exit(asyncio.run(main(int(sys.argv[1]), int(sys.argv[2]))))
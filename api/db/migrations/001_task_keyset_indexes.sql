@@ -0,0 +1,9 @@
+-- Keyset pagination for /tasks/list column segments.
+-- Lets "(position, taskID) > (?, ?) ORDER BY position, taskID" seek straight
+-- to the next page instead of scanning and discarding OFFSET rows.
+
+CREATE INDEX idx_tasks_user_column_position
+    ON tasks (userID, columnID, position, taskID);
+
+CREATE INDEX idx_tasks_user_project_column_position
+    ON tasks (userID, projectID, columnID, position, taskID);
@@ -0,0 +1,23 @@
+-- Per-user change log behind GET /projects/{username}/tasks/changes.
+-- change_seq hands out one sequence number per mutating transaction;
+-- change_log keeps the latest change of every task, subtask and project.
+
+CREATE TABLE IF NOT EXISTS change_seq (
+    userID INT NOT NULL PRIMARY KEY,
+    seq BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    -- highest sequence purged by compaction, older cursors must resync
+    compacted_through BIGINT UNSIGNED NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS change_log (
+    userID INT NOT NULL,
+    entity ENUM('task', 'subtask', 'project') NOT NULL,
+    entityID INT NOT NULL,
+    projectID INT NULL,
+    op ENUM('create', 'update', 'reorder', 'delete') NOT NULL,
+    seq BIGINT UNSIGNED NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (userID, entity, entityID),
+    KEY idx_change_log_user_seq (userID, seq),
+    KEY idx_change_log_changed_at (changed_at)
+);
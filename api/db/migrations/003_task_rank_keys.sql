@@ -0,0 +1,14 @@
+-- Fractional rank keys for kanban card order (see api/db/rank.py).
+-- A move writes the moved card's key only, instead of renumbering the
+-- position of every card after it. Existing cards start without a key;
+-- the rank rebalancer backfills them in their current position order on
+-- startup, so position is only read for rows it hasn't reached yet.
+
+ALTER TABLE tasks
+    ADD COLUMN rank_key VARCHAR(64) CHARACTER SET ascii COLLATE ascii_bin NULL;
+
+CREATE INDEX idx_tasks_user_column_rank
+    ON tasks (userID, columnID, rank_key, taskID);
+
+CREATE INDEX idx_tasks_user_project_column_rank
+    ON tasks (userID, projectID, columnID, rank_key, taskID);
@@ -0,0 +1,6 @@
+-- Full-text search behind GET /projects/{username}/tasks/search.
+-- Matches are looked up in the index instead of scanning every title and
+-- description with LIKE; the userID filter is applied to the matches.
+
+ALTER TABLE tasks
+    ADD FULLTEXT INDEX ft_tasks_title_description (title, description);
@@ -0,0 +1,30 @@
+-- Tag index behind the `tag` filter of /tasks/list and /tasks/board.
+-- tasks.tags keeps the JSON array the API has always written; task_tags
+-- holds one row per (task, tag) derived from it in the same transaction
+-- (see api/db/tag_index.py), so a tag lookup is a primary key range read
+-- instead of a scan that parses every row's JSON.
+
+CREATE TABLE IF NOT EXISTS task_tags (
+    userID INT NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    taskID INT NOT NULL,
+    color VARCHAR(32) NULL,
+    -- position of the tag in tasks.tags, the board lists tags in this order
+    ord INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (userID, name, taskID),
+    KEY idx_task_tags_task (taskID, ord),
+    CONSTRAINT fk_task_tags_task FOREIGN KEY (taskID)
+        REFERENCES tasks (taskID) ON DELETE CASCADE
+);
+
+-- backfill from the existing JSON
+INSERT INTO task_tags (userID, name, taskID, color, ord)
+SELECT t.userID, jt.name, t.taskID, MAX(jt.color), MIN(jt.ord)
+FROM tasks t,
+     JSON_TABLE(IF(JSON_VALID(t.tags), t.tags, '[]'), '$[*]' COLUMNS (
+         ord FOR ORDINALITY,
+         name VARCHAR(100) PATH '$.name' NULL ON EMPTY NULL ON ERROR,
+         color VARCHAR(32) PATH '$.color' NULL ON EMPTY NULL ON ERROR)) jt
+WHERE jt.name IS NOT NULL
+GROUP BY t.userID, jt.name, t.taskID
+ON DUPLICATE KEY UPDATE color = VALUES(color), ord = LEAST(ord, VALUES(ord));
@@ -0,0 +1,13 @@
+-- Indexes for the due date and priority filters and sorts of /tasks/list.
+-- Every list query is scoped to (userID, columnID); these put the filtered
+-- or sorted column right after that prefix, so a due date range or a
+-- priority is an index range read, and the due date sort and ascending
+-- priority sort need no filesort. Run
+-- `python -m api.db.filter_plans <userID> <columnID>` to EXPLAIN every
+-- filter combination against a database.
+
+CREATE INDEX idx_tasks_user_column_due
+    ON tasks (userID, columnID, end_date, taskID);
+
+CREATE INDEX idx_tasks_user_column_priority
+    ON tasks (userID, columnID, priorityID, rank_key, taskID);
@@ -0,0 +1,20 @@
+-- The priorities lookup table, as the queries built since keyset pagination
+-- read it: TASK_LIST_FROM (list, board, search, delta sync), the export,
+-- the import's priority check and the bulk set_priority operation all join
+-- priorities.priorityID = tasks.priorityID and read priority_name as the
+-- `priority` the get_kanban_* procedures return. No DDL ships with the
+-- repo, so this states that schema.
+--
+-- On a database that already has the table under these names this is a
+-- no-op. If the columns are named differently, the INSERT below fails here
+-- with 1054 instead of every list and board request failing at runtime;
+-- rename them in those queries before deploying.
+
+CREATE TABLE IF NOT EXISTS priorities (
+    priorityID INT NOT NULL PRIMARY KEY,
+    priority_name VARCHAR(50) NOT NULL
+);
+
+-- TaskCreateSchema defaults to priority 1; existing rows are left as they are
+INSERT IGNORE INTO priorities (priorityID, priority_name)
+VALUES (1, 'Low'), (2, 'Medium'), (3, 'High');
@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import suppress
+import logging
+import time
+from typing import Optional
+
+from asyncmy.errors import InterfaceError, OperationalError  # type: ignore
+from api.config import settings
+
+
+HEALTH_CHECK_INTERVAL = settings.DB_HEALTH_CHECK_INTERVAL
+HEALTH_CHECK_TIMEOUT = settings.DB_HEALTH_CHECK_TIMEOUT
+
+# CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED
+CONNECTION_LOST_CODES = (2003, 2006, 2013, 2055)
+
+logger = logging.getLogger("users_logger")
+
+
+class PoolHealthStats:
+    def __init__(self) -> None:
+        self.checks = 0
+        self.evictions = 0
+        self.reconnects = 0
+        self.last_check_at: Optional[float] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "checks": self.checks,
+            "evictions": self.evictions,
+            "reconnects": self.reconnects,
+            "last_check_at": self.last_check_at,
+        }
+
+
+pool_health = PoolHealthStats()
+
+
+def is_connection_lost(exc: BaseException) -> bool:
+    """True when the error means the socket to MySQL is unusable."""
+    if isinstance(exc, (ConnectionError, asyncio.IncompleteReadError)):
+        return True
+    if isinstance(exc, (OperationalError, InterfaceError)):
+        code = exc.args[0] if exc.args else None
+        # asyncmy raises InterfaceError(0, '') once the stream is closed
+        return code in CONNECTION_LOST_CODES or code == 0
+    return False
+
+
+async def validate_idle_connections(pool) -> int:
+    """
+    Pings every connection that has been idle for a full interval and evicts
+    the ones that no longer answer. Returns the number of evicted connections.
+    """
+    # Check connections out the same way Pool._acquire does so the pool size
+    # stays accurate and nobody else can grab one mid-ping.
+    async with pool.cond:
+        now = time.time()
+        idle = [conn for conn in pool._free
+                if pool._loop.time() - conn.last_usage >= HEALTH_CHECK_INTERVAL]
+        for conn in idle:
+            pool._free.remove(conn)
+            pool._used.add(conn)
+
+    evicted = 0
+    for conn in idle:
+        try:
+            await asyncio.wait_for(conn.ping(reconnect=False), HEALTH_CHECK_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Evicting dead pooled connection: {e}")
+            conn.close()
+            evicted += 1
+        await pool.release(conn)
+
+    # top the pool back up to minsize so requests don't pay the reconnect
+    if evicted:
+        async with pool.cond:
+            await pool.fill_free_pool(False)
+
+    pool_health.checks += 1
+    pool_health.evictions += evicted
+    pool_health.last_check_at = now
+    return evicted
+
+
+async def health_check_loop(pool, name: str = "Database") -> None:
+    while True:
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+        try:
+            await validate_idle_connections(pool)
+        except Exception as e:
+            logger.error(f"{name} pool health check failed: {e}")
+
+
+def start_health_checker(pool, name: str = "Database") -> asyncio.Task:
+    logger.info(
+        f"Starting {name.lower()} pool health checker every {HEALTH_CHECK_INTERVAL}s.")
+    return asyncio.create_task(health_check_loop(pool, name))
+
+
+async def stop_health_checker(task: Optional[asyncio.Task]) -> None:
+    if task is None:
+        return
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
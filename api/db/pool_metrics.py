@@ -0,0 +1,154 @@
+import asyncio
+import collections
+from contextlib import suppress
+import logging
+from typing import Deque, Dict, Iterable, Optional
+
+from api.config import settings
+
+
+POOL_MAXSIZE = settings.DB_POOL_MAXSIZE
+ADAPTIVE_MAXSIZE = settings.DB_POOL_ADAPTIVE_MAXSIZE
+ADAPTIVE_INTERVAL = settings.DB_POOL_ADAPTIVE_INTERVAL
+GROW_WAIT_MS = settings.DB_POOL_GROW_WAIT_MS
+SHRINK_WAIT_MS = settings.DB_POOL_SHRINK_WAIT_MS
+
+# rolling window of samples kept per series
+SAMPLE_WINDOW = 1000
+
+logger = logging.getLogger("users_logger")
+
+
+def percentile(samples: Iterable[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencySeries:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = collections.deque(maxlen=SAMPLE_WINDOW)
+
+    def record(self, value_ms: float) -> None:
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+        self.samples.append(value_ms)
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(percentile(self.samples, 50), 2),
+            "p95_ms": round(percentile(self.samples, 95), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class PoolMetrics:
+    """Acquire wait and per-route checkout timings for the MySQL pool."""
+
+    def __init__(self) -> None:
+        self.acquire_wait = LatencySeries()
+        self.checkouts: Dict[str, LatencySeries] = collections.defaultdict(
+            LatencySeries)
+        self.resizes = 0
+        # waits since the last adaptive sizing decision
+        self.recent_waits: Deque[float] = collections.deque(
+            maxlen=SAMPLE_WINDOW)
+
+    def record_acquire(self, wait_ms: float) -> None:
+        self.acquire_wait.record(wait_ms)
+        self.recent_waits.append(wait_ms)
+
+    def record_checkout(self, route: str, held_ms: float) -> None:
+        self.checkouts[route].record(held_ms)
+
+    def snapshot(self, pool) -> dict:
+        pool_state = {}
+        if pool is not None:
+            pool_state = {
+                "size": pool.size,
+                "minsize": pool.minsize,
+                "maxsize": pool.maxsize,
+                "in_use": len(pool._used),
+                "idle": pool.freesize,
+            }
+        return {
+            **pool_state,
+            "resizes": self.resizes,
+            "acquire_wait": self.acquire_wait.summary(),
+            "checkouts": {route: series.summary()
+                          for route, series in self.checkouts.items()},
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+async def resize_pool(pool, maxsize: int) -> bool:
+    """
+    Changes the pool's upper bound in place. asyncmy keeps maxsize as the
+    maxlen of its free deque, so the deque is rebuilt under the pool lock.
+    Shrinking only happens when every open connection still fits.
+    """
+    async with pool.cond:
+        if maxsize == pool.maxsize or maxsize < pool.minsize:
+            return False
+        if maxsize < pool.maxsize and pool.size > maxsize:
+            return False
+
+        pool._free = collections.deque(pool._free, maxlen=maxsize)
+        pool.cond.notify_all()
+
+    pool_metrics.resizes += 1
+    return True
+
+
+async def adapt_pool_size(pool) -> None:
+    """Grow or shrink maxsize by one based on the p95 acquire wait."""
+    if len(pool_metrics.recent_waits) < 20:
+        return
+
+    p95_wait = percentile(pool_metrics.recent_waits, 95)
+
+    if p95_wait > GROW_WAIT_MS and pool.maxsize < ADAPTIVE_MAXSIZE:
+        if await resize_pool(pool, pool.maxsize + 1):
+            logger.info(
+                f"Pool p95 acquire wait {p95_wait:.1f}ms, grew maxsize to {pool.maxsize}")
+
+    elif p95_wait < SHRINK_WAIT_MS and pool.maxsize > POOL_MAXSIZE:
+        if await resize_pool(pool, pool.maxsize - 1):
+            logger.info(
+                f"Pool p95 acquire wait {p95_wait:.1f}ms, shrank maxsize to {pool.maxsize}")
+
+    # judge the next interval on fresh samples only
+    pool_metrics.recent_waits.clear()
+
+
+async def adaptive_loop(pool) -> None:
+    while True:
+        await asyncio.sleep(ADAPTIVE_INTERVAL)
+        try:
+            await adapt_pool_size(pool)
+        except Exception as e:
+            logger.error(f"Adaptive pool sizing failed: {e}")
+
+
+def start_pool_tuner(pool) -> asyncio.Task:
+    logger.info(
+        f"Adaptive pool sizing enabled, maxsize {POOL_MAXSIZE}-{ADAPTIVE_MAXSIZE}.")
+    return asyncio.create_task(adaptive_loop(pool))
+
+
+async def stop_pool_tuner(task: Optional[asyncio.Task]) -> None:
+    if task is None:
+        return
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
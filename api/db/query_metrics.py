@@ -0,0 +1,105 @@
+import collections
+import logging
+import re
+import zlib
+from typing import Dict, Optional
+
+from api.config import settings
+from api.db.pool_metrics import LatencySeries
+from api.models.entities import SlowQueryLog
+
+
+SLOW_QUERY_THRESHOLD_MS = settings.SLOW_QUERY_THRESHOLD_MS
+
+# upper bounds (ms) of the latency histogram buckets, the last one is open
+HISTOGRAM_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+STATEMENT_KEY_LENGTH = 160
+
+# literals are stripped so the same statement with different values groups together
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+logger = logging.getLogger("users_logger")
+
+
+def statement_key(method: str, statement: str) -> str:
+    if method == "callproc":
+        return f"CALL {statement}"
+
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    if len(normalized) <= STATEMENT_KEY_LENGTH:
+        return normalized
+    # statements that share a long prefix must not share a key
+    digest = zlib.crc32(normalized.encode()) & 0xFFFFFFFF
+    return f"{normalized[:STATEMENT_KEY_LENGTH]}... #{digest:08x}"
+
+
+class StatementStats(LatencySeries):
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows = 0
+        self.slow = 0
+        self.errors = 0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def observe(self, elapsed_ms: float, rows: int, failed: bool) -> None:
+        self.record(elapsed_ms)
+        self.rows += max(rows, 0)
+        self.errors += int(failed)
+        self.slow += int(elapsed_ms >= SLOW_QUERY_THRESHOLD_MS)
+
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def summary(self) -> dict:
+        labels = [f"le_{bound}ms" for bound in HISTOGRAM_BUCKETS] + ["inf"]
+        return {
+            **super().summary(),
+            "rows": self.rows,
+            "slow": self.slow,
+            "errors": self.errors,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class QueryMetrics:
+    """Latency histograms and row counts per statement run through a session."""
+
+    def __init__(self) -> None:
+        self.statements: Dict[str, StatementStats] = collections.defaultdict(
+            StatementStats)
+
+    def observe(self, method: str, statement: str, elapsed_ms: float, rows: int,
+                route: str, request_id: Optional[str], failed: bool = False) -> None:
+        key = statement_key(method, statement)
+        self.statements[key].observe(elapsed_ms, rows, failed)
+
+        if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+            slow_log = SlowQueryLog(
+                req_id=request_id or "-",
+                route=route,
+                statement=key,
+                elapsed_ms=round(elapsed_ms, 2),
+                rows=rows,
+            )
+            logger.warning(slow_log.model_dump())
+
+    def snapshot(self) -> dict:
+        # slowest statements first
+        ordered = sorted(self.statements.items(),
+                         key=lambda item: item[1].total_ms, reverse=True)
+        return {
+            "slow_query_threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+            "statements": {key: stats.summary() for key, stats in ordered},
+        }
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,186 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from api.config import settings
+
+
+# Base-62 digits in ASCII order, so keys compare correctly as plain strings
+# (the rank_key column uses the ascii_bin collation). A key is a fraction
+# 0.<digits> and never ends in the zero digit, which guarantees there is
+# always room for another key between any two of them.
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+ZERO = DIGITS[0]
+
+# past this length a column is respread by the rebalancer
+RANK_KEY_REBALANCE_LENGTH = settings.RANK_KEY_REBALANCE_LENGTH
+# the rank_key column width, a move that would go past it respreads right away
+RANK_KEY_MAX_LENGTH = 64
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    if high is not None:
+        # shared prefix: split what follows it
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else ZERO) == high[n]:
+            n += 1
+        if n > 0:
+            return high[:n] + _midpoint(low[n:], high[n:])
+
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high else BASE
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high + 1) // 2]
+
+    # adjacent digits: keep the low digit and split its remainder upwards
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+# Appends and prepends count in units of this many digits past the key's
+# saturated prefix (leading top digits going up, zeros going down), so
+# keys grow by STEP_WIDTH digits per ~119k consecutive appends to one
+# column instead of one digit every ~31.
+STEP_WIDTH = 3
+
+
+def _step(key: str, up: bool) -> Optional[str]:
+    edge = DIGITS[-1] if up else ZERO
+    saturated = len(key) - len(key.lstrip(edge))
+    width = max(len(key), saturated + STEP_WIDTH)
+    digits = [DIGITS.index(char) for char in key.ljust(width, ZERO)]
+    for index in reversed(range(len(digits))):
+        if up and digits[index] < BASE - 1:
+            digits[index] += 1
+            break
+        if not up and digits[index] > 0:
+            digits[index] -= 1
+            break
+        digits[index] = 0 if up else BASE - 1
+    else:
+        return None
+
+    stepped = "".join(DIGITS[digit] for digit in digits).rstrip(ZERO)
+    return stepped or None
+
+
+def key_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    A key sorting strictly between `before` and `after`; None stands for the
+    start or end of the column.
+    """
+    low = before or ""
+    if after is not None and low >= after:
+        raise ValueError(f"rank keys out of order: {before!r} >= {after!r}")
+    if low.endswith(ZERO) or (after or "").endswith(ZERO):
+        raise ValueError("rank keys must not end in the zero digit")
+
+    if before and after is None:
+        return _step(before, up=True) or _midpoint(low, None)
+    if after and before is None:
+        return _step(after, up=False) or _midpoint("", after)
+    return _midpoint(low, after)
+
+
+def spread_keys(count: int) -> List[str]:
+    """
+    `count` evenly spaced keys of equal, minimal length, so every gap
+    takes many moves to use up.
+    """
+    if count <= 0:
+        return []
+
+    length = 1
+    while BASE ** length <= count * 4:
+        length += 1
+    span = BASE ** length
+
+    keys = []
+    for index in range(1, count + 1):
+        value = index * span // (count + 1)
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip(ZERO))
+    return keys
+
+
+def append_keys(last_key: Optional[str], count: int) -> Optional[List[str]]:
+    """
+    `count` ascending keys after `last_key`, for cards added to the bottom
+    of a column, or None when they would outgrow the rank_key column and
+    the column has to be respread instead.
+    """
+    keys: List[str] = []
+    for _ in range(count):
+        last_key = key_between(last_key, None)
+        if len(last_key) > RANK_KEY_MAX_LENGTH:
+            return None
+        keys.append(last_key)
+    return keys
+
+
+def needs_respread(keys: List[Optional[str]]) -> bool:
+    return any(key is None or len(key) > RANK_KEY_MAX_LENGTH for key in keys)
+
+
+def column_index(rows: List[dict], index: int, project_id: Optional[int]) -> int:
+    """
+    Where a card dropped at `index` goes in the whole column `rows`. The
+    index counts the cards the client's board shows: all of them, or only
+    those of `project_id` on a board filtered to one project, in which case
+    the card lands just before the project's card at that index (or after
+    its last one).
+    """
+    if project_id is None:
+        return max(0, min(index, len(rows)))
+
+    shown = [position for position, row in enumerate(rows) if row.get("projectID") == project_id]
+    if index < len(shown):
+        return shown[max(index, 0)]
+    return shown[-1] + 1 if shown else len(rows)
+
+
+def apply_moves(columns: Dict[int, List[dict]],
+                moves: List[Tuple[int, int, int, Optional[int]]]) -> Set[int]:
+    """
+    Applies (taskID, destination columnID, index, projectID) moves in order
+    to `columns`, the ordered rows ({taskID, projectID, rank_key, columnID})
+    of every column involved, and returns the ids of the rows whose key or
+    column changed. The index is read as column_index does. Normally
+    that's just the moved cards; a column holding unkeyed rows or keys too
+    long to split (or out of order) is respread as a whole.
+    """
+    located = {row["taskID"]: column_id
+               for column_id, rows in columns.items() for row in rows}
+    changed: Set[int] = set()
+
+    for task_id, column_id, index, project_id in moves:
+        source = columns[located[task_id]]
+        row = next(row for row in source if row["taskID"] == task_id)
+        source.remove(row)
+
+        target = columns.setdefault(column_id, [])
+        index = column_index(target, index, project_id)
+        target.insert(index, row)
+        row["columnID"] = column_id
+        located[task_id] = column_id
+        changed.add(task_id)
+
+        before = target[index - 1]["rank_key"] if index > 0 else None
+        after = target[index + 1]["rank_key"] if index + 1 < len(target) else None
+        neighbours = [key for key, present in ((before, index > 0),
+                                               (after, index + 1 < len(target))) if present]
+        in_order = before is None or after is None or before < after
+        if in_order and not needs_respread(neighbours):
+            row["rank_key"] = key_between(before, after)
+            if len(row["rank_key"]) <= RANK_KEY_MAX_LENGTH:
+                continue
+
+        for target_row, key in zip(target, spread_keys(len(target))):
+            if target_row["rank_key"] != key:
+                target_row["rank_key"] = key
+                changed.add(target_row["taskID"])
+
+    return changed
@@ -0,0 +1,167 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+import logging
+from typing import AsyncGenerator, Iterable, List, Optional, Tuple
+
+from asyncmy.cursors import DictCursor  # type: ignore
+from fastapi import FastAPI
+from api.board_cache import board_cache, set_ranks
+from api.config import settings
+from api.data_version import data_version
+from api.db import change_log
+from api.db.database import DB_NAME, execute_batch, get_session_context
+from api.db.rank import RANK_KEY_REBALANCE_LENGTH, append_keys, spread_keys
+from api.db.resilience import DB_ERRORS
+
+
+RANK_REBALANCE_INTERVAL = settings.RANK_REBALANCE_INTERVAL
+RANK_REBALANCE_BATCH = settings.RANK_REBALANCE_BATCH
+
+logger = logging.getLogger("users_logger")
+
+
+# Columns with unkeyed cards (rows from before rank keys, or copied by
+# duplicate_user_project) or with keys grown long from repeated inserts
+# into the same gap.
+WORN_COLUMNS_QUERY = f"""
+    SELECT userID, columnID FROM {DB_NAME}.tasks
+    WHERE rank_key IS NULL OR LENGTH(rank_key) > %s
+    GROUP BY userID, columnID
+    LIMIT %s
+"""
+
+
+# a column's cards in their current order, unkeyed ones by legacy position
+COLUMN_ROWS_QUERY = f"""
+    SELECT taskID, projectID, columnID, rank_key FROM {DB_NAME}.tasks
+    WHERE userID = %s AND columnID = %s
+    ORDER BY rank_key, position, taskID
+    FOR UPDATE
+"""
+
+
+def respread_statements(user_id: int, changed: List[dict]):
+    """UPDATEs and change log entries for rows given fresh keys."""
+    return [
+        *[(f"UPDATE {DB_NAME}.tasks SET rank_key = %s WHERE userID = %s AND taskID = %s",
+           (row['rank_key'], user_id, row['taskID'])) for row in changed],
+        *[change_log.log_change(user_id, change_log.TASK, change_log.REORDER,
+                                row['taskID'], row['projectID']) for row in changed],
+    ]
+
+
+async def column_append_keys(cursor, user_id: int, column_id: int,
+                             last_key: Optional[str], count: int) -> Tuple[List[str], List[dict]]:
+    """
+    Keys for `count` cards added to the bottom of a column, inside the
+    caller's transaction (after change_log.next_sequence). When they would
+    outgrow the rank_key column the column is respread right away, leaving
+    the last `count` keys for the new cards. Returns the keys and the
+    existing rows that were rewritten, for the caller to publish.
+    """
+    keys = append_keys(last_key, count)
+    if keys is not None:
+        return keys, []
+
+    result_sets = await execute_batch(cursor, [(COLUMN_ROWS_QUERY, (user_id, column_id))])
+    rows = result_sets[-1] if result_sets else []
+    spread = spread_keys(len(rows) + count)
+
+    changed = []
+    for row, key in zip(rows, spread):
+        if row['rank_key'] != key:
+            row['rank_key'] = key
+            changed.append(row)
+    if changed:
+        await execute_batch(cursor, respread_statements(user_id, changed))
+    logger.info(f"Respread column {column_id} of user {user_id} to append {count} cards.")
+    return spread[len(rows):], changed
+
+
+async def rebalance_column(conn, cursor, user_id: int, column_id: int) -> int:
+    """
+    Gives every card of the user's column a fresh, evenly spaced key in its
+    current order, in a transaction of its own. Unkeyed cards keep the
+    order of their legacy position. Returns the number of cards rewritten.
+    """
+    try:
+        result_sets = await execute_batch(cursor, [
+            *change_log.next_sequence(user_id),
+            (COLUMN_ROWS_QUERY, (user_id, column_id)),
+        ])
+        rows = result_sets[-1] if result_sets else []
+
+        changed = []
+        for row, key in zip(rows, spread_keys(len(rows))):
+            if row['rank_key'] != key:
+                row['rank_key'] = key
+                changed.append(row)
+
+        if not changed:
+            await conn.rollback()
+            return 0
+
+        await execute_batch(cursor, respread_statements(user_id, changed))
+        await conn.commit()
+    except DB_ERRORS:
+        await conn.rollback()
+        raise
+
+    for project_id in {row['projectID'] for row in changed}:
+        await data_version.bump(user_id, project_id)
+    await board_cache.apply(user_id, set_ranks(changed))
+    return len(changed)
+
+
+async def rebalance_user_columns(conn, user_id: int, column_ids: Iterable[int]) -> int:
+    async with conn.cursor(cursor=DictCursor) as cursor:
+        rewritten = 0
+        for column_id in sorted(set(column_ids)):
+            rewritten += await rebalance_column(conn, cursor, user_id, column_id)
+        return rewritten
+
+
+async def rebalance_worn_columns():
+    """
+    Respreads up to RANK_REBALANCE_BATCH worn columns. Returns how many
+    columns were found and how many card keys were rewritten.
+    """
+    async with get_session_context(route="rank_rebalance") as conn:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            await cursor.execute(WORN_COLUMNS_QUERY,
+                                 (RANK_KEY_REBALANCE_LENGTH, RANK_REBALANCE_BATCH))
+            columns = await cursor.fetchall()
+            # the lookup opened a transaction, each column gets its own
+            await conn.rollback()
+
+            rewritten = 0
+            for column in columns:
+                rewritten += await rebalance_column(
+                    conn, cursor, column['userID'], column['columnID'])
+            return len(columns), rewritten
+
+
+async def rebalance_loop() -> None:
+    # the first pass runs at startup and backfills keys for existing cards
+    while True:
+        found = 0
+        try:
+            found, rewritten = await rebalance_worn_columns()
+            if rewritten:
+                logger.info(f"Rank rebalancer rewrote {rewritten} card keys.")
+        except Exception as e:
+            logger.error(f"Rank rebalance failed: {e}")
+        # a full batch means there may be more, keep going right away
+        if found < RANK_REBALANCE_BATCH:
+            await asyncio.sleep(RANK_REBALANCE_INTERVAL)
+
+
+@asynccontextmanager
+async def rank_rebalancer_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    task = asyncio.create_task(rebalance_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+from asyncmy.errors import Error as AsyncmyError  # type: ignore
+from fastapi import HTTPException, status
+from mysql.connector import Error as ConnectorError
+from api.config import settings
+from api.db.pool_health import is_connection_lost
+
+
+RETRY_ATTEMPTS = settings.DB_RETRY_ATTEMPTS
+RETRY_BASE_DELAY = settings.DB_RETRY_BASE_DELAY
+RETRY_MAX_DELAY = settings.DB_RETRY_MAX_DELAY
+BREAKER_FAILURE_THRESHOLD = settings.DB_BREAKER_FAILURE_THRESHOLD
+BREAKER_RESET_TIMEOUT = settings.DB_BREAKER_RESET_TIMEOUT
+
+# what the routers catch: the asyncmy driver's errors plus the legacy
+# mysql.connector ones still raised by a few helpers
+DB_ERRORS = (AsyncmyError, ConnectorError)
+
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+DEADLOCK = "deadlock"
+LOCK_WAIT_TIMEOUT = "lock_wait_timeout"
+CONNECTION_LOST = "connection_lost"
+PERMANENT = "permanent"
+
+logger = logging.getLogger("users_logger")
+
+
+def classify_error(exc: BaseException) -> str:
+    if is_connection_lost(exc):
+        return CONNECTION_LOST
+
+    code = exc.args[0] if isinstance(exc, DB_ERRORS) and exc.args else None
+    if code == ER_LOCK_DEADLOCK:
+        return DEADLOCK
+    if code == ER_LOCK_WAIT_TIMEOUT:
+        return LOCK_WAIT_TIMEOUT
+    return PERMANENT
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given (1-based) retry attempt."""
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Trips after BREAKER_FAILURE_THRESHOLD consecutive connection failures and
+    rejects new database work for BREAKER_RESET_TIMEOUT seconds. After that a
+    single trial request is let through; its outcome closes or re-opens it,
+    and everyone else is rejected until then. A trial that never reports
+    (its request ended before running a statement) gives up the slot after
+    BREAKER_RESET_TIMEOUT.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_started_at: Optional[float] = None
+        self.trips = 0
+        self.rejected = 0
+        self.retries = 0
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable. Try again shortly.",
+            headers={"Retry-After": str(BREAKER_RESET_TIMEOUT)},
+        )
+
+    def before_call(self) -> None:
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            assert self.opened_at is not None
+            if now - self.opened_at < BREAKER_RESET_TIMEOUT:
+                self._reject()
+            self.state = self.HALF_OPEN
+            logger.info("Database circuit half-open, letting a trial through.")
+        elif self.state == self.HALF_OPEN:
+            if (self.probe_started_at is not None
+                    and now - self.probe_started_at < BREAKER_RESET_TIMEOUT):
+                self._reject()
+            logger.warning("Database circuit trial never reported, letting another through.")
+        else:
+            return
+        self.probe_started_at = now
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Database circuit closed.")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probe_started_at = None
+        if self.state == self.HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            if self.state != self.OPEN:
+                self.trips += 1
+                logger.error(
+                    f"Database circuit opened after {self.failures} connection failures.")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trial_in_flight": self.probe_started_at is not None,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retries": self.retries,
+        }
+
+
+circuit_breaker = CircuitBreaker()
+
+
+def is_retryable(kind: str, attempt: int, pristine: bool) -> bool:
+    """
+    Whether a failed statement may be run again.
+
+    A deadlock rolls back the whole transaction and a lost connection loses
+    it, so both are only safe when the statement was the first one since
+    checkout or commit. A lock wait timeout only rolls back the statement.
+    """
+    if attempt >= RETRY_ATTEMPTS:
+        return False
+    if kind == LOCK_WAIT_TIMEOUT:
+        return True
+    if kind in (DEADLOCK, CONNECTION_LOST):
+        return pristine
+    return False
+
+
+async def wait_before_retry(kind: str, attempt: int, exc: BaseException) -> None:
+    circuit_breaker.retries += 1
+    delay = backoff_delay(attempt)
+    logger.warning(
+        f"Transient database error ({kind}), retry {attempt}/{RETRY_ATTEMPTS - 1} in {delay * 1000:.0f}ms: {exc}")
+    await asyncio.sleep(delay)
@@ -0,0 +1,62 @@
+from typing import Dict, List, Sequence
+
+from api.db.change_log import Statement
+from api.db.database import DB_NAME
+
+
+# tasks.tags (a JSON array of {name, color}) stays the source of truth;
+# task_tags is derived from it in the same transaction as every write, keyed
+# (userID, name, taskID) so "tasks with tag X" is a primary key range read.
+# The board reads its tags back from here, so TagSchema keeps names and
+# colors within the column sizes and rejects names the collation would
+# merge; only rows written before that check can differ from tasks.tags.
+
+def sync_task_tags(user_id: int, where: str, params: Sequence) -> List[Statement]:
+    """
+    Rebuilds the task_tags rows of the user's tasks matching `where` (a
+    condition on tasks aliased as t) from their tags column. Send it after
+    the statement that writes the tags.
+    """
+    return [
+        (f"""DELETE tt FROM {DB_NAME}.task_tags tt
+             INNER JOIN {DB_NAME}.tasks t ON t.taskID = tt.taskID
+             WHERE t.userID = %s AND {where}""", (user_id, *params)),
+        (f"""INSERT INTO {DB_NAME}.task_tags (userID, name, taskID, color, ord)
+             SELECT t.userID, jt.name, t.taskID, MAX(jt.color), MIN(jt.ord)
+             FROM {DB_NAME}.tasks t,
+                  JSON_TABLE(IF(JSON_VALID(t.tags), t.tags, '[]'), '$[*]' COLUMNS (
+                      ord FOR ORDINALITY,
+                      name VARCHAR(100) PATH '$.name' NULL ON EMPTY NULL ON ERROR,
+                      color VARCHAR(32) PATH '$.color' NULL ON EMPTY NULL ON ERROR)) jt
+             WHERE t.userID = %s AND {where} AND jt.name IS NOT NULL
+             GROUP BY t.userID, jt.name, t.taskID
+             ON DUPLICATE KEY UPDATE color = VALUES(color), ord = LEAST(ord, VALUES(ord))""",
+         (user_id, *params)),
+    ]
+
+
+def tag_filter(param: str = "tag") -> str:
+    """Condition on tasks aliased as t, for a named `param` holding the tag name."""
+    return (f"t.taskID IN (SELECT ft.taskID FROM {DB_NAME}.task_tags ft"
+            f" WHERE ft.userID = %(user_id)s AND ft.name = %({param})s)")
+
+
+def group_tags(rows) -> Dict[int, List[dict]]:
+    """task_tags rows (taskID, name, color) in order, as tag lists per task."""
+    tags: Dict[int, List[dict]] = {}
+    for row in rows:
+        tags.setdefault(row['taskID'], []).append(
+            {"name": row['name'], "color": row['color']})
+    return tags
+
+
+def board_tags_statement(scope: str, params: dict):
+    """The tags of every task in `scope`, the board query's WHERE clause."""
+    return (f"""
+        SELECT tt.taskID, tt.name, tt.color
+        FROM {DB_NAME}.task_tags tt
+        INNER JOIN {DB_NAME}.tasks t ON t.taskID = tt.taskID
+        WHERE tt.userID = %(user_id)s AND {scope}
+        ORDER BY tt.taskID, tt.ord
+    """, params)
+
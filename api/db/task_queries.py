@@ -0,0 +1,232 @@
+import base64
+import binascii
+import json
+from datetime import datetime, time, timedelta
+import re
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from api.db.database import DB_NAME
+from api.db.tag_index import board_tags_statement, tag_filter
+from api.models.entities import TaskListFilters
+
+
+# Task rows for the list and board. Cards are ordered by (rank_key, taskID);
+# their position is the index in that order and is worked out by the caller.
+TASK_LIST_COLUMNS = f"""
+    t.taskID, t.projectID, p.project_name AS projectName, t.title,
+    t.description, t.tags AS tags_raw, t.columnID, kc.column_name AS status,
+    pr.priority_name AS priority, t.rank_key, t.start_date, t.end_date,
+    t.is_completed,
+    (SELECT COUNT(*) FROM {DB_NAME}.sub_tasks st
+        WHERE st.taskID = t.taskID) AS total_subtasks,
+    (SELECT COUNT(*) FROM {DB_NAME}.sub_tasks st
+        WHERE st.taskID = t.taskID AND st.is_completed = 1) AS completed_subtasks
+"""
+
+# priorities (priorityID, priority_name) is the lookup behind the
+# procedures' `priority`, its schema is stated in migration 007
+TASK_LIST_FROM = f"""
+    FROM {DB_NAME}.tasks t
+    INNER JOIN {DB_NAME}.projects p ON p.projectID = t.projectID
+    INNER JOIN {DB_NAME}.kanban_columns kc ON kc.columnID = t.columnID
+    LEFT JOIN {DB_NAME}.priorities pr ON pr.priorityID = t.priorityID
+"""
+
+TASK_ORDER = "t.rank_key ASC, t.taskID ASC"
+
+
+def encode_cursor(rank_key: str, task_id: int, position: int) -> str:
+    """
+    Opaque keyset cursor pointing just past (rank_key, taskID); `position`
+    is the index of the next card so positions carry on across pages.
+    """
+    raw = json.dumps({"r": rank_key, "t": task_id, "o": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(data["r"]), int(data["t"]), int(data["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed pagination cursor."
+        )
+
+
+# ORDER BY of each /tasks/list sort. Position is the board order and the
+# only one with keyset cursors; the others page with OFFSET. Each leads
+# with a column of a (userID, [projectID,] columnID, ...) index so the page
+# is read in index order. Tasks without a due date sort first ascending and
+# last descending, as MySQL orders NULLs; sorting them last both ways would
+# take an expression the index can't serve. A descending priority sort
+# keeps ties in board order, and that mixed direction is sorted by MySQL.
+LIST_SORTS = {
+    "position": TASK_ORDER,
+    "due_date": "t.end_date {order}, t.taskID {order}",
+    "priority": "t.priorityID {order}, t.rank_key ASC, t.taskID ASC",
+}
+
+
+def list_order(filters: Optional[TaskListFilters]) -> str:
+    if filters is None:
+        return TASK_ORDER
+    return LIST_SORTS[filters.sort].format(order=filters.order.upper())
+
+
+def filter_conditions(filters: Optional[TaskListFilters]) -> Tuple[List[str], dict]:
+    """
+    Parameterised conditions on tasks aliased as t for `filters`. Each one
+    is a range or equality on a column that follows (userID, columnID) in
+    an index, or a semi-join on the task_tags primary key.
+    """
+    if filters is None:
+        return [], {}
+
+    conditions: List[str] = []
+    params: dict = {}
+    if filters.due_from is not None:
+        conditions.append("t.end_date >= %(due_from)s")
+        params["due_from"] = datetime.combine(filters.due_from, time.min)
+    if filters.due_to is not None:
+        conditions.append("t.end_date < %(due_before)s")
+        params["due_before"] = datetime.combine(filters.due_to + timedelta(days=1), time.min)
+    if filters.priority:
+        conditions.append("t.priorityID IN %(priority)s")
+        params["priority"] = tuple(filters.priority)
+    if filters.tag is not None:
+        conditions.append(tag_filter())
+        params["tag"] = filters.tag
+    if filters.completed is not None:
+        conditions.append("t.is_completed = %(completed)s")
+        params["completed"] = int(filters.completed)
+    if filters.overdue is True:
+        conditions.append("t.end_date < CURRENT_TIMESTAMP AND t.is_completed = 0")
+    elif filters.overdue is False:
+        conditions.append(
+            "(t.end_date IS NULL OR t.end_date >= CURRENT_TIMESTAMP OR t.is_completed = 1)")
+    return conditions, params
+
+
+def _column_scope(project_id: Optional[int], filters: Optional[TaskListFilters]) -> Tuple[str, dict]:
+    scope = "t.userID = %(user_id)s AND t.columnID = %(column_id)s"
+    if project_id is not None:
+        scope += " AND t.projectID = %(project_id)s"
+    conditions, params = filter_conditions(filters)
+    return " AND ".join([scope, *conditions]), params
+
+
+def column_page_statements(user_id: int, project_id: Optional[int], column_id: int,
+                           size: int, offset: int, filters: Optional[TaskListFilters] = None):
+    """
+    Statements for one OFFSET page of a column plus its total, meant to be
+    sent together through execute_batch.
+    """
+    scope, filter_params = _column_scope(project_id, filters)
+    params = {"user_id": user_id, "project_id": project_id, "column_id": column_id,
+              "limit": size, "offset": offset, **filter_params}
+
+    page_query = f"""
+        SELECT {TASK_LIST_COLUMNS}
+        {TASK_LIST_FROM}
+        WHERE {scope}
+        ORDER BY {list_order(filters)}
+        LIMIT %(limit)s OFFSET %(offset)s
+    """
+    total_query = f"SELECT COUNT(*) AS total_count FROM {DB_NAME}.tasks t WHERE {scope}"
+
+    return [(page_query, params), (total_query, params)]
+
+
+def column_keyset_statements(user_id: int, project_id: Optional[int], column_id: int,
+                             after: Tuple[str, int], size: int,
+                             filters: Optional[TaskListFilters] = None):
+    """
+    Statements for one keyset page of a column (in position order) plus its
+    total, meant to be sent together through execute_batch. One row past
+    `size` is fetched to tell whether another page exists. Both hit the
+    (userID, [projectID,] columnID, rank_key, taskID) indexes.
+    """
+    scope, filter_params = _column_scope(project_id, filters)
+    params = {"user_id": user_id, "project_id": project_id, "column_id": column_id,
+              "after_key": after[0], "after_task_id": after[1], "limit": size + 1,
+              **filter_params}
+
+    page_query = f"""
+        SELECT {TASK_LIST_COLUMNS}
+        {TASK_LIST_FROM}
+        WHERE {scope}
+          AND (t.rank_key, t.taskID) > (%(after_key)s, %(after_task_id)s)
+        ORDER BY {TASK_ORDER}
+        LIMIT %(limit)s
+    """
+    total_query = f"SELECT COUNT(*) AS total_count FROM {DB_NAME}.tasks t WHERE {scope}"
+
+    return [(page_query, params), (total_query, params)]
+
+
+def board_statements(user_id: int, project_id: Optional[int], tag: Optional[str] = None):
+    """
+    Every card of the user's board (or one project's), column by column,
+    and their tags from task_tags, meant to be sent together through
+    execute_batch.
+    """
+    params = {"user_id": user_id, "project_id": project_id, "tag": tag}
+    scope = "t.userID = %(user_id)s"
+    if project_id is not None:
+        scope += " AND t.projectID = %(project_id)s"
+    if tag is not None:
+        scope += " AND " + tag_filter()
+
+    return [(f"""
+        SELECT {TASK_LIST_COLUMNS}
+        {TASK_LIST_FROM}
+        WHERE {scope}
+        ORDER BY t.columnID ASC, {TASK_ORDER}
+    """, params), board_tags_statement(scope, params)]
+
+
+# InnoDB's default innodb_ft_min_token_size; shorter words aren't indexed
+FULLTEXT_MIN_TOKEN = 3
+SEARCH_MAX_TERMS = 8
+
+
+def search_terms(query: str) -> Optional[str]:
+    """
+    The words of a free text query as a BOOLEAN MODE expression in which
+    every word is required and may be a prefix ("kanb" finds "kanban").
+    Operators typed by the user are dropped, not interpreted.
+    """
+    words = [word for word in re.findall(r"\w+", query.lower())
+             if len(word) >= FULLTEXT_MIN_TOKEN]
+    words = list(dict.fromkeys(words))[:SEARCH_MAX_TERMS]
+    if not words:
+        return None
+    return " ".join(f"+{word}*" for word in words)
+
+
+def search_statement(user_id: int, project_id: Optional[int], terms: str,
+                     size: int, offset: int):
+    """
+    One page of the user's tasks matching `terms`, best match first, served
+    by the ft_tasks_title_description FULLTEXT index. One row past `size`
+    is fetched to tell whether another page exists.
+    """
+    params = {"user_id": user_id, "project_id": project_id, "terms": terms,
+              "limit": size + 1, "offset": offset}
+    scope = "t.userID = %(user_id)s"
+    if project_id is not None:
+        scope += " AND t.projectID = %(project_id)s"
+
+    return (f"""
+        SELECT {TASK_LIST_COLUMNS},
+               MATCH(t.title, t.description) AGAINST (%(terms)s IN BOOLEAN MODE) AS score
+        {TASK_LIST_FROM}
+        WHERE {scope}
+          AND MATCH(t.title, t.description) AGAINST (%(terms)s IN BOOLEAN MODE)
+        ORDER BY score DESC, t.taskID DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+    """, params)
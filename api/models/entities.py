@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
 import json
-from typing import List, Optional
+from typing import List, Literal, Optional
+import unicodedata
 
-from pydantic import AliasGenerator, BaseModel, ConfigDict, EmailStr, Field, field_validator
+from pydantic import AliasGenerator, BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
 from pydantic.alias_generators import to_camel
 
 
@@ -31,6 +32,14 @@ class ErrorLog(BaseModel):
     req_id: str
     error_message: str
 
+
+class SlowQueryLog(BaseModel):
+    req_id: str
+    route: str
+    statement: str
+    elapsed_ms: float
+    rows: int
+
 class EmailRequest(BaseModel):
     email: EmailStr
 
@@ -153,8 +162,24 @@ class UserChangePassword(BaseModelConfig):
 
 
 class TagSchema(BaseModel):
-    name: str
-    color: str
+    # the sizes of the task_tags columns
+    name: str = Field(..., max_length=100)
+    color: str = Field(..., max_length=32)
+
+
+def check_unique_tag_names(tags: Optional[List[TagSchema]]) -> Optional[List[TagSchema]]:
+    """
+    Rejects tag names that task_tags' case and accent insensitive collation
+    would store as one row ("Bug", "bug", "bùg").
+    """
+    seen = set()
+    for tag in tags or []:
+        folded = "".join(char for char in unicodedata.normalize("NFKD", tag.name)
+                         if not unicodedata.combining(char)).casefold()
+        if folded in seen:
+            raise ValueError(f"Duplicate tag name '{tag.name}'.")
+        seen.add(folded)
+    return tags
 
 
 class TaskInDB(BaseModelConfig):
@@ -212,12 +237,37 @@ class CreateSubtaskSchema(BaseModelConfig):
 class KanbanReorderSchema(BaseModelConfig):
     taskID: int = Field(..., alias="taskId")
     destination_column_id: int = Field(..., alias="destinationColumnId")
-    new_position: int = Field(..., alias="newPosition")
+    new_position: int = Field(
+        ..., alias="newPosition",
+        description="0-based index among the destination column's cards as the board shows them: "
+                    "every project's, or only projectId's when set")
+    projectID: Optional[int] = Field(
+        default=None, alias="projectId",
+        description="The project the client's board is filtered to (GET /board?project_id=), if any")
 
     class Config:
         populate_by_name = True
 
 
+class KanbanReorderBatchSchema(BaseModelConfig):
+    moves: List[KanbanReorderSchema] = Field(..., min_length=1, max_length=100,
+                                             description="Card moves, applied in order")
+
+
+class TaskPosition(BaseModelConfig):
+    taskID: int
+    columnID: int
+    position: int = Field(
+        ..., description="0-based index in the column, counted like the moves' newPosition")
+    rank_key: Optional[str] = None
+
+
+class KanbanReorderBatchResponse(BaseModelConfig):
+    status: str
+    positions: List[TaskPosition] = Field(
+        default_factory=list, description="Resulting positions in every column the moves touched")
+
+
 class CreateSubtaskList(BaseModelConfig):
     subtasks: List[CreateSubtaskSchema] = Field(...,
                                                 min_length=1,
@@ -235,6 +285,10 @@ class CreateTagsList(BaseModelConfig):
     tags: List[TagSchema] = Field(..., min_length=1,
                                   description="List of tasks tags to add")
 
+    @field_validator('tags')
+    def unique_tag_names(cls, value):
+        return check_unique_tag_names(value)
+
 
 class TaskCreateSchema(TaskInDB):
     projectID: int = Field(default=0)
@@ -267,6 +321,10 @@ class TaskCreateSchema(TaskInDB):
                 return None
         return value
 
+    @field_validator('tags')
+    def unique_tag_names(cls, value):
+        return check_unique_tag_names(value)
+
     #  Intercept stringified lists ("" or "[]") and parse them into a native Python list
     @field_validator('subtasks', mode='before')
     def sanitize_subtasks_list(cls, value):
@@ -286,6 +344,38 @@ class TaskDeleteSchema(BaseModelConfig):
     projectID: int = Field(default=0)
 
 
+class TaskBulkSchema(BaseModelConfig):
+    taskIDs: List[int] = Field(..., min_length=1, max_length=500,
+                               description="Tasks to apply the operation to")
+    operation: Literal["delete", "move", "set_priority", "replace_tags"]
+    columnID: Optional[int] = Field(
+        default=None, description="Destination column of a move")
+    priorityID: Optional[int] = Field(
+        default=None, description="Priority for set_priority")
+    tags: Optional[List[TagSchema]] = Field(
+        default=None, max_length=10, description="New tags for replace_tags")
+
+    @field_validator('tags')
+    def unique_tag_names(cls, value):
+        return check_unique_tag_names(value)
+
+    @model_validator(mode='after')
+    def check_operation_argument(self):
+        required = {"move": "columnID", "set_priority": "priorityID",
+                    "replace_tags": "tags"}.get(self.operation)
+        if required and getattr(self, required) is None:
+            raise ValueError(f"{required} is required for {self.operation}")
+        self.taskIDs = list(dict.fromkeys(self.taskIDs))
+        return self
+
+
+class TaskBulkResponse(BaseModelConfig):
+    status: str
+    operation: str
+    affected: int
+    taskIDs: List[int] = Field(default_factory=list)
+
+
 class TaskGetList(TaskInDB):
     position: Optional[int] = None
     description: Optional[str] = None
@@ -313,6 +403,8 @@ class ColumnSegment(BaseModelConfig):
         default=0, description="Total absolute tasks matching this status query in DB")
     has_more: bool = Field(
         default=False, description="Flags if another chunk remains on the server")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque keyset cursor for the next chunk of this column")
     tasks: List[TaskGetList] = Field(default_factory=list)
 
 
@@ -321,12 +413,38 @@ class SegmentedTasksResponse(BaseModelConfig):
     segments: dict[str, ColumnSegment]
 
 
+class TaskListFilters(BaseModel):
+    """Filters and sort order of /tasks/list, all optional and combinable."""
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    priority: List[int] = Field(default_factory=list)
+    status: List[int] = Field(
+        default_factory=list, description="Column ids to return segments for")
+    tag: Optional[str] = None
+    completed: Optional[bool] = None
+    overdue: Optional[bool] = None
+    sort: Literal["position", "due_date", "priority"] = "position"
+    order: Literal["asc", "desc"] = "asc"
+
+
+class TaskSearchResponse(BaseModelConfig):
+    query: str
+    page: int = 1
+    size: int = 20
+    has_more: bool = False
+    tasks: List[TaskGetList] = Field(
+        default_factory=list, description="Matching tasks, best match first")
+
+
 class TaskGetKanban(TaskInDB):
-    position: Optional[int] = Field(default_factory=int)
+    position: Optional[int] = Field(
+        default_factory=int, description="0-based index in the column of the board as requested")
+    rank_key: Optional[str] = Field(
+        default=None, description="Sort key of the card within its column")
     tags: Optional[object] = None
     display_date: Optional[str] = None
-    task_key: str = Field(default="TSK-1000",
-                          validation_alias="taskKey")
+    task_key: str = Field(default="TSK-1000", validation_alias="taskKey",
+                          description="TSK-<taskID>")
     total_subtasks: int = 0
     completed_subtasks: int = 0
 
@@ -343,6 +461,19 @@ class Project(BaseModelConfig):
     color: str
 
 
+class ChangesResponse(BaseModelConfig):
+    version: int = Field(
+        description="Change sequence to pass as `since` on the next call")
+    full_resync: bool = Field(
+        default=False, description="Changes since `since` are no longer available, refetch the board")
+    tasks: List[TaskGetKanban] = Field(default_factory=list)
+    deleted_tasks: List[int] = Field(default_factory=list)
+    subtasks: List[SubTaskResponseSchema] = Field(default_factory=list)
+    deleted_subtasks: List[int] = Field(default_factory=list)
+    projects: List[Project] = Field(default_factory=list)
+    deleted_projects: List[int] = Field(default_factory=list)
+
+
 class ProjectAdd(Project):
     projectID: Optional[int] = None
     project_name: str
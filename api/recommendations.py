@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from asyncmy.cursors import DictCursor  # type: ignore
+from api.config import settings
+from api.db import redis_backend
+from api.db.database import DB_NAME
+
+logger = logging.getLogger("users_logger")
+
+LOCAL_TTL = settings.RECOMMENDATIONS_LOCAL_TTL
+REDIS_TTL = settings.RECOMMENDATIONS_REDIS_TTL
+CACHE_ROWS = settings.RECOMMENDATIONS_CACHE_ROWS
+REDIS_KEY = "recommendations:head"
+
+SELECT_STMT = f"""SELECT id, title FROM {DB_NAME}.recommendations ORDER BY id ASC LIMIT %(limit)s OFFSET %(offset)s"""
+
+
+class RecommendationsPage:
+    def __init__(self, items: List[dict], etag: str) -> None:
+        self.items = items
+        self.etag = etag
+
+
+def content_etag(items: List[dict]) -> str:
+    digest = hashlib.sha256(json.dumps(
+        items, sort_keys=True, default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class Recommendations():
+    """
+    Read-through cache for the head of the recommendations table (its first
+    CACHE_ROWS rows): one in-process copy, backed by one Redis key shared
+    across instances, backed by MySQL. Pages are slices of the head, so
+    the cache stays one entry whatever offsets clients ask for; pages past
+    it are read from MySQL uncached. Entries expire by TTL only, nothing in
+    the API writes the table.
+    """
+
+    def __init__(self) -> None:
+        self._local: Optional[Tuple[float, List[dict]]] = None
+
+    async def get_cached_head(self) -> Optional[List[dict]]:
+        if self._local and self._local[0] > time.monotonic():
+            return self._local[1]
+
+        redis_client = redis_backend.redis_client
+        if redis_client is None:
+            return None
+        try:
+            payload = await redis_client.get(REDIS_KEY)
+        except Exception as e:
+            logger.warning(f"Recommendations cache read failed: {e}")
+            return None
+        if not payload:
+            return None
+
+        head = json.loads(payload)
+        self._local = (time.monotonic() + LOCAL_TTL, head)
+        return head
+
+    async def _select(self, conn, limit: int, offset: int) -> List[dict]:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            await cursor.execute(SELECT_STMT, {'limit': limit, 'offset': offset})
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def get_head(self, conn) -> List[dict]:
+        head = await self.get_cached_head()
+        if head is not None:
+            return head
+
+        logger.info('Recommendations cache miss')
+        head = await self._select(conn, CACHE_ROWS, 0)
+        self._local = (time.monotonic() + LOCAL_TTL, head)
+
+        redis_client = redis_backend.redis_client
+        if redis_client is not None:
+            try:
+                await redis_client.setex(REDIS_KEY, REDIS_TTL, json.dumps(head, default=str))
+            except Exception as e:
+                logger.warning(f"Recommendations cache write failed: {e}")
+
+        return head
+
+    async def get_page(self, conn, limit: int, offset: int) -> RecommendationsPage:
+        head = await self.get_head(conn)
+        # a head shorter than CACHE_ROWS is the whole table
+        if offset + limit <= len(head) or len(head) < CACHE_ROWS:
+            items = head[offset:offset + limit]
+        else:
+            items = await self._select(conn, limit, offset)
+
+        return RecommendationsPage(items=items, etag=content_etag(items))
+
+
+recommendations = Recommendations()
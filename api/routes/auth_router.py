@@ -8,7 +8,7 @@ from asyncmy.cursors import DictCursor  # type: ignore
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from mysql.connector import Error
+from api.db.resilience import DB_ERRORS
 from pytz import timezone
 from api.auth import (REFRESH_TOKEN_COOKIE_NAME, REFRESH_TOKEN_DOMAIN,
                       REFRESH_TOKEN_MAX_AGE, REFRESH_TOKEN_RENEWAL_THRESHOLD, auth_token_response,
@@ -222,7 +222,7 @@ async def login_for_access_token(background_tasks: BackgroundTasks,
             logger.info(f'{token_data['sub']} login successful')
             return response
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -331,7 +331,7 @@ async def create_user(user: UserCreate, background_tasks: BackgroundTasks,
                 "is_verified": False
             }
 
-    except Error as e:
+    except DB_ERRORS as e:
         await conn.rollback()
         logger.error(f"Database registration error: {e}")
         raise HTTPException(
@@ -498,7 +498,7 @@ async def revoke_token(current_user: TokenData = Depends(get_current_user),
 
             return response
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -558,7 +558,7 @@ async def get_new_access_token(token: RefreshTokenData = Depends(get_refresh_tok
 
         return response
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Server refresh token error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
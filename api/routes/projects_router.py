@@ -7,9 +7,14 @@ from asyncmy.connection import Connection  # type: ignore
 from asyncmy.cursors import DictCursor  # type: ignore
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
-from mysql.connector import Error
+from api.db.resilience import DB_ERRORS
 from pydantic import ValidationError
-from api.db.database import DB_NAME, get_session
+from api.board_cache import board_cache
+from api.data_version import data_version
+from api.db import change_log
+from api.db.database import DB_NAME, execute_batch, get_read_session, get_session
+from api.db.rank_rebalancer import rebalance_user_columns
+from api.db.tag_index import sync_task_tags
 from api.models.entities import (Project, ProjectAdd, ProjectGetResponse, ProjectSuccessResponse,
                                  ProjectUpdate, TokenData)
 from api.users import users
@@ -32,9 +37,11 @@ async def add_project(
             user_id = await users.get_user_id(cursor, params)
 
             params = (user_id, project.project_name, project.color)
-            await cursor.callproc('add_project', params)
+            result_sets = await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                ("CALL add_project(%s, %s, %s)", params)])
 
-            project_record = await cursor.fetchone()
+            project_record = result_sets[0][0] if result_sets and result_sets[0] else None
 
             if not project_record:
                 await conn.rollback()
@@ -43,15 +50,19 @@ async def add_project(
                     detail="Failed to retrieve newly created project."
                 )
 
+            new_project_id = project_record['projectID']
+            await cursor.execute(*change_log.log_change(
+                user_id, change_log.PROJECT, change_log.CREATE, new_project_id, new_project_id))
             await conn.commit()
 
             project_model = Project(**project_record)
+            await data_version.bump(user_id, project_model.projectID)
 
             return ProjectSuccessResponse(**{
                 'projectID': project_model.projectID,
                 'message': f'{project_model.project_name} added successfully'})
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -69,10 +80,11 @@ async def duplicate_project(
             params = (current_user.sub, '')
             user_id = await users.get_user_id(cursor, params)
 
-            await cursor.callproc('duplicate_user_project',
-                                  (user_id, project_id))
+            result_sets = await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                ("CALL duplicate_user_project(%s, %s)", (user_id, project_id))])
 
-            project_record = await cursor.fetchone()
+            project_record = result_sets[0][0] if result_sets and result_sets[0] else None
 
             if not project_record:
                 await conn.rollback()
@@ -81,9 +93,37 @@ async def duplicate_project(
                     detail="Failed to retrieve newly created project."
                 )
 
+            new_project_id = project_record['projectID']
+            follow_up_rows = await execute_batch(cursor, [
+                change_log.log_change(
+                    user_id, change_log.PROJECT, change_log.CREATE, new_project_id, new_project_id),
+                change_log.log_changes_from(
+                    user_id, change_log.TASK, change_log.CREATE,
+                    f"SELECT taskID AS entityID, projectID FROM {DB_NAME}.tasks WHERE userID = %s AND projectID = %s",
+                    (user_id, new_project_id)),
+                change_log.log_changes_from(
+                    user_id, change_log.SUBTASK, change_log.CREATE,
+                    f"""SELECT st.subTaskID AS entityID, t.projectID FROM {DB_NAME}.sub_tasks st
+                        INNER JOIN {DB_NAME}.tasks t ON t.taskID = st.taskID
+                        WHERE t.userID = %s AND t.projectID = %s""",
+                    (user_id, new_project_id)),
+                *sync_task_tags(user_id, "t.projectID = %s", (new_project_id,)),
+                (f"SELECT DISTINCT columnID FROM {DB_NAME}.tasks WHERE userID = %s AND projectID = %s",
+                 (user_id, new_project_id)),
+            ])
             await conn.commit()
+            # a copied project brings its own tasks onto the "all projects" board
+            await board_cache.invalidate(user_id)
+            copied_columns = follow_up_rows[-1] if follow_up_rows else []
+            # the copies have no rank keys yet, place them in their columns now
+            try:
+                await rebalance_user_columns(conn, user_id, [row['columnID'] for row in copied_columns])
+            except DB_ERRORS as e:
+                # the project is already copied, the rank rebalancer catches up
+                logger.warning(f"Rank keys for duplicated project {new_project_id} deferred: {e}")
 
             project_model = Project(**project_record)
+            await data_version.bump(user_id, project_model.projectID)
 
             return ProjectSuccessResponse(**{
                 'projectID': project_model.projectID,
@@ -95,7 +135,7 @@ async def duplicate_project(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="An error occurred while duplicating project.")
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -104,7 +144,7 @@ async def duplicate_project(
 
 # TODO: add a response model
 @projects_router.get('/', response_model=List[ProjectGetResponse], status_code=status.HTTP_200_OK)
-async def get_user_projects(conn: Connection = Depends(get_session),
+async def get_user_projects(conn: Connection = Depends(get_read_session),
                             current_user: TokenData = Depends(get_current_user)):
     try:
 
@@ -123,7 +163,7 @@ async def get_user_projects(conn: Connection = Depends(get_session),
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="An error occurred while fetching projects.")
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An error occurred while fetching projects.")
@@ -156,9 +196,19 @@ async def update_project(
             params = {**update_data,
                       'project_id': project_id, "user_id": user_id}
 
-            await cursor.execute(update_stmt, params)
+            await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                (update_stmt, params),
+                change_log.log_changes_from(
+                    user_id, change_log.PROJECT, change_log.UPDATE,
+                    f"SELECT projectID AS entityID, projectID FROM {DB_NAME}.projects WHERE userID = %s AND projectID = %s",
+                    (user_id, project_id)),
+            ])
 
             await conn.commit()
+            # cards carry the project name
+            await data_version.bump(user_id, project_id)
+            await board_cache.invalidate(user_id)
 
             return ProjectSuccessResponse(**{
                 'message': f'Project update successful',
@@ -170,7 +220,7 @@ async def update_project(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="An error occurred while updating projects.")
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -190,13 +240,22 @@ async def delete_project(
 
             delete_stmt = f"DELETE from {DB_NAME}.projects WHERE projectID = %(project_id)s AND userID = %(user_id)s"
 
-            await cursor.execute(
-                delete_stmt, {'project_id': project_id, 'user_id': user_id})
+            # clients drop the tasks of a deleted project along with it
+            await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                change_log.log_changes_from(
+                    user_id, change_log.PROJECT, change_log.DELETE,
+                    f"SELECT projectID AS entityID, projectID FROM {DB_NAME}.projects WHERE userID = %s AND projectID = %s",
+                    (user_id, project_id)),
+                (delete_stmt, {'project_id': project_id, 'user_id': user_id}),
+            ])
             await conn.commit()
+            await data_version.bump(user_id, project_id)
+            await board_cache.invalidate(user_id)
 
             return JSONResponse(content={'message': f'Project deleted successfully'})
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -12,15 +12,57 @@ from asyncmy.cursors import DictCursor  # type: ignore
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from api.utils import get_current_user
-from api.db.database import DB_NAME, get_session
+from api.db.database import DB_NAME, execute_batch, get_read_session, get_session
+from api.board_cache import board_cache, update_task_fields
+from api.data_version import data_version
+from api.db import change_log
 from api.users import users
-from mysql.connector import Error
+from api.db.resilience import DB_ERRORS
 
 
 logger = logging.getLogger("users_logger")
 sub_task_router = APIRouter(
     prefix='/projects/{username}/tasks/{task_id}/sub-tasks', tags=['SubTasks'])
 
+# read back after each change so the cached board card gets absolute counts
+SUBTASK_COUNTS_QUERY = f"""
+    SELECT t.projectID, COUNT(st.subTaskID) AS total_subtasks,
+           COALESCE(SUM(st.is_completed = 1), 0) AS completed_subtasks
+    FROM {DB_NAME}.tasks t
+    LEFT JOIN {DB_NAME}.sub_tasks st ON st.taskID = t.taskID
+    WHERE t.userID = %s AND t.taskID = %s
+    GROUP BY t.projectID
+"""
+
+SUBTASKS_OF_TASK = f"""
+    SELECT st.subTaskID AS entityID, t.projectID FROM {DB_NAME}.sub_tasks st
+    INNER JOIN {DB_NAME}.tasks t ON t.taskID = st.taskID
+    WHERE st.userID = %s AND st.taskID = %s
+"""
+
+
+def log_subtask_changes(user_id: int, task_id: int, op: str, subtasks_query: str, *extra_params):
+    # the parent card's subtask counts change along with the subtasks
+    return [
+        change_log.log_changes_from(user_id, change_log.SUBTASK, op, subtasks_query,
+                                    (user_id, task_id, *extra_params)),
+        change_log.log_changes_from(
+            user_id, change_log.TASK, change_log.UPDATE,
+            f"SELECT taskID AS entityID, projectID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID = %s",
+            (user_id, task_id)),
+    ]
+
+
+async def publish_subtask_change(user_id: int, task_id: int, result_sets) -> None:
+    counts = result_sets[-1][0] if result_sets and result_sets[-1] else None
+    if counts is None:
+        return
+    await data_version.bump(user_id, counts['projectID'])
+    await board_cache.apply(user_id, update_task_fields(
+        task_id,
+        total_subtasks=int(counts['total_subtasks']),
+        completed_subtasks=int(counts['completed_subtasks'])))
+
 
 @sub_task_router.post('/', status_code=status.HTTP_201_CREATED)
 async def create_subtasks(task_id: int, payload: CreateSubtaskList, conn:  Connection = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
@@ -34,15 +76,22 @@ async def create_subtasks(task_id: int, payload: CreateSubtaskList, conn:  Conne
 
             st_params = (user_id, task_id, subtasks_json_string)
 
-            await cursor.callproc('add_subtasks', st_params)
+            result_sets = await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                ("CALL add_subtasks(%s, %s, %s)", st_params),
+                *log_subtask_changes(user_id, task_id, change_log.CREATE, SUBTASKS_OF_TASK),
+                (SUBTASK_COUNTS_QUERY, (user_id, task_id)),
+            ])
             await conn.commit()
 
+            await publish_subtask_change(user_id, task_id, result_sets)
+
             return {
                 "status": "success",
                 "message": f"Successfully added {len(payload.subtasks)} subtasks to task {task_id} for user {user_id}."
             }
 
-    except Error as e:
+    except DB_ERRORS as e:
         print(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -63,16 +112,23 @@ async def complete_subtask(task_id: int,
             params = (current_user.sub, '')
             user_id = await users.get_user_id(cursor, params)
 
-            await cursor.execute(query, (payload.is_completed, user_id, task_id, payload.subTaskID))
-
+            result_sets = await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                (query, (payload.is_completed, user_id, task_id, payload.subTaskID)),
+                *log_subtask_changes(user_id, task_id, change_log.UPDATE,
+                                     SUBTASKS_OF_TASK + " AND st.subTaskID = %s", payload.subTaskID),
+                (SUBTASK_COUNTS_QUERY, (user_id, task_id)),
+            ])
             await conn.commit()
 
+            await publish_subtask_change(user_id, task_id, result_sets)
+
             return {
                 "status": "success",
                 "message": f"Successfully {'completed' if payload.is_completed else 'undone completed'} subtask {payload.subTaskID}."
             }
 
-    except Error as e:
+    except DB_ERRORS as e:
         print(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -80,7 +136,7 @@ async def complete_subtask(task_id: int,
 
 
 @sub_task_router.get('/', status_code=status.HTTP_200_OK, response_model=List[SubTaskResponseSchema])
-async def get_sub_tasks(task_id: int, conn: Connection = Depends(get_session), current_user: TokenData = Depends(get_current_user)):
+async def get_sub_tasks(task_id: int, conn: Connection = Depends(get_read_session), current_user: TokenData = Depends(get_current_user)):
     query = f"""
         SELECT st.subTaskID, st.taskID, st.title, st.is_completed, st.position 
         FROM {DB_NAME}.sub_tasks st
@@ -101,7 +157,7 @@ async def get_sub_tasks(task_id: int, conn: Connection = Depends(get_session), c
 
             return result
 
-    except Error as e:
+    except DB_ERRORS as e:
         print(f"Database error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Something went wrong when fetching sub task {str(e)}")
@@ -2,21 +2,34 @@ import asyncio
 from datetime import date, datetime
 import json
 import logging
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
 from pydantic import ValidationError
 
 from asyncmy.connection import Connection  # type: ignore
 from asyncmy.cursors import DictCursor  # type: ignore
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse
-from mysql.connector import Error
-from api.db.database import DB_NAME, get_session
-from api.models.entities import ColumnSegment, CreateTagsList, KanbanReorderSchema, SegmentedTasksResponse, TaskCreateSchema, TaskDeleteSchema, TaskGetList, TasksResponseKanban, TokenData
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from api.config import settings
+from api.db.resilience import DB_ERRORS
+from api.db.database import DB_NAME, execute_batch, gather_on_pool, get_read_session, get_session, get_session_context, primary_session, read_pool
+from api.db.column_cache import kanban_columns
+from api.db.task_queries import FULLTEXT_MIN_TOKEN, TASK_LIST_COLUMNS, TASK_LIST_FROM, board_statements, column_keyset_statements, column_page_statements, decode_cursor, encode_cursor, search_statement, search_terms
+from api.db.rank import apply_moves
+from api.db.rank_rebalancer import column_append_keys
+from api.db.tag_index import group_tags, sync_task_tags
+from api.board_cache import board_cache, remove_task, set_ranks, update_task_fields, upsert_task
+from api.board_events import HEARTBEAT_INTERVAL, board_events
+from api.data_version import data_version
+from api.db import change_log
+from api import task_export, task_import
+from api.models.entities import ChangesResponse, ColumnSegment, CreateTagsList, KanbanReorderBatchResponse, KanbanReorderBatchSchema, KanbanReorderSchema, SegmentedTasksResponse, TaskBulkResponse, TaskBulkSchema, TaskCreateSchema, TaskDeleteSchema, TaskGetList, TaskListFilters, TaskSearchResponse, TasksResponseKanban, TokenData
 from api.users import users
 from api.utils import get_current_user
 
 
+CHANGES_MAX_ENTRIES = settings.CHANGES_MAX_ENTRIES
+
 logger = logging.getLogger("users_logger")
 task_router = APIRouter(
     prefix='/projects/{username}/tasks', tags=['Tasks', 'Sub-Tasks'])
@@ -40,108 +53,280 @@ def get_display_date(end_date: Union[datetime, str, None]) -> str:
     return display_date
 
 
+def board_task_from_row(row: dict) -> dict:
+    """
+    Board card for a task row. Accepts the get_kanban_* procedure rows as
+    well as TASK_LIST_COLUMNS rows (projectName, tags_raw).
+    """
+    end_date = row.get('end_date')
+    return {
+        "projectID": row.get('projectID'),
+        "taskID": row.get('taskID'),
+        "project_name": row.get('project_name', row.get('projectName')),
+        "title": row.get('title'),
+        "description": row.get('description'),
+        "tags": row.get('tags', row.get('tags_raw')),
+        "position": row.get('position'),
+        "rank_key": row.get('rank_key'),
+        "task_key": row.get('taskKey', f"TSK-{row.get('taskID')}"),
+        "is_completed": row.get('is_completed'),
+        "priority": row.get('priority'),
+        "start_date": row.get('start_date'),
+        "end_date": end_date,
+        "total_subtasks": int(row.get('total_subtasks') or 0),
+        "completed_subtasks": int(row.get('completed_subtasks') or 0),
+        "display_date": get_display_date(end_date=end_date)
+    }
+
+
+def build_board(results, column_names: Dict[int, str],
+                tags: Dict[int, List[dict]]) -> List[dict]:
+    """`tags` are the cards' tag lists from task_tags, no JSON to decode."""
+    # every workflow column shows up, even without cards
+    board_map = {col_id: {"columnID": col_id, "column_name": name, "tasks": []}
+                 for col_id, name in sorted(column_names.items())}
+
+    for row in results:
+        col_id = row.get('columnID')
+
+        if col_id is None:
+            continue
+
+        if col_id not in board_map:
+            board_map[col_id] = {
+                "columnID": col_id,
+                "column_name": column_names.get(col_id) or row.get('status'),
+                "tasks": []
+            }
+
+        if row.get('taskID') is not None:
+            tasks = board_map[col_id]["tasks"]
+            tasks.append({**board_task_from_row(row), "position": len(tasks),
+                          "tags": tags.get(row['taskID'], [])})
+
+    return list(board_map.values())
+
+
+def list_task_from_row(row: dict, position: Optional[int]) -> TaskGetList:
+    """List card for a TASK_LIST_COLUMNS row."""
+    p_name = row.get('projectName') or row.get(
+        'project_name') or "Unknown Project"
+
+    row_data = {
+        "projectID": row.get('projectID'),
+        "taskID": row.get('taskID'),
+        "projectName": p_name,
+        "title": row.get('title'),
+        "priority": row.get('priority'),
+        "status": row.get('status'),
+        "tags": row.get('tags_raw') or "",
+        "columnID": row.get('columnID'),
+        "position": position,
+        "task_key": row.get('taskKey', f"TSK-{row.get('taskID')}"),
+        "startDate": row.get('start_date') or row.get('startDate'),
+        "endDate": row.get('end_date') or row.get('endDate'),
+        "is_completed": bool(row.get('is_completed', False)),
+        "total_subtasks": row.get('total_subtasks') or 0,
+        "completed_subtasks": row.get('completed_subtasks') or 0,
+    }
+
+    task = TaskGetList(**row_data)
+    task.displayDate = get_display_date(end_date=task.endDate)
+    return task
+
+
+def build_column_segment(
+    results, column_id: int, column_name: str,
+    size: int, offset: int, page: int,
+    total: Optional[int] = None, has_more: Optional[bool] = None
+) -> ColumnSegment:
+    """`offset` is the position of the first row in the column."""
+    empty_segment = ColumnSegment(
+        columnID=column_id,
+        column_name=column_name,
+        page=page,
+        size=size,
+        total=0,
+        has_more=False,
+        tasks=[]
+    )
+
+    if not results:
+        return empty_segment
+
+    # Check if results contains a "null" mock row
+    first_row = results[0]
+    if first_row is None or (isinstance(first_row, dict) and first_row.get('taskID') is None):
+        return empty_segment
+
+    raw_total = first_row.get('total_count', 0) if total is None else total
+    total_count = int(raw_total) if raw_total is not None else 0
+
+    tasks_list = []
+    last_row = None
+
+    try:
+        for row in results:
+            task_id = row.get('taskID')
+            # skip any corrupt/empty row
+            if not row or task_id is None:
+                continue
+
+            tasks_list.append(list_task_from_row(row, offset + len(tasks_list)))
+            last_row = row
+
+    except ValidationError as val_err:
+        logger.error(
+            f"Pydantic mapping failed on column segment {column_name}: {str(val_err)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Database record shape failed parsing validation bounds."
+        )
+
+    if has_more is None:
+        has_more = (offset + len(tasks_list)) < total_count
+
+    next_cursor = None
+    if has_more and last_row is not None and last_row.get('rank_key') is not None:
+        next_cursor = encode_cursor(last_row['rank_key'], last_row['taskID'],
+                                    offset + len(tasks_list))
+
+    return ColumnSegment(
+        columnID=column_id,
+        column_name=column_name,
+        page=page,
+        size=size,
+        total=total_count,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        tasks=tasks_list
+    )
+
+
 async def fetch_single_column_segment(
     cursor, user_id: int, project_id: Optional[int],
     column_id: int, column_name: str,
-    size: int, offset: int, page: int
+    size: int, offset: int, page: int, filters: Optional[TaskListFilters] = None
 ) -> ColumnSegment:
 
-    safe_column_id = column_id if column_id is not None else 0
+    result_sets = await execute_batch(cursor, column_page_statements(
+        user_id, project_id, column_id, size, offset, filters))
 
-    if project_id is not None:
-        proc_name = "get_user_tasks_by_project"
-        proc_params = (user_id, project_id, safe_column_id, size, offset)
-    else:
-        proc_name = "get_user_all_tasks"
-        proc_params = (user_id, safe_column_id, size, offset)
+    return segment_from_result_sets(result_sets, column_id=column_id, column_name=column_name,
+                                    size=size, offset=offset, page=page, filters=filters)
 
-    try:
 
-        logger.debug(
-            f'Params - {proc_params}, {proc_name}, {type(project_id)}')
-        await cursor.callproc(proc_name, proc_params)
+def keyset_pages(filters: Optional[TaskListFilters]) -> bool:
+    # cursors hold a rank key, so they only work in position order
+    return filters is None or filters.sort == "position"
 
-        results = await cursor.fetchall()
 
-        if not results:
-            return ColumnSegment(
-                columnID=column_id,
-                column_name=column_name,
-                page=page,
-                size=size,
-                total=0,
-                has_more=False,
-                tasks=[]
-            )
+def segment_from_result_sets(result_sets, column_id: int, column_name: str,
+                             size: int, offset: int, page: int,
+                             filters: Optional[TaskListFilters] = None) -> ColumnSegment:
+    rows = result_sets[0] if result_sets else []
+    total_rows = result_sets[1] if len(result_sets) > 1 else []
+    total = total_rows[0].get('total_count', 0) if total_rows else 0
 
-        # Check if results contains a "null" mock row
-        first_row = results[0]
-        if first_row is None or (isinstance(first_row, dict) and first_row.get('taskID') is None):
-            return ColumnSegment(
-                columnID=column_id,
-                column_name=column_name,
-                page=page,
-                size=size,
-                total=0,
-                has_more=False,
-                tasks=[]
-            )
+    segment = build_column_segment(rows, column_id=column_id, column_name=column_name,
+                                   size=size, offset=offset, page=page, total=total)
+    if not keyset_pages(filters):
+        segment.next_cursor = None
+    return segment
 
-        raw_total = first_row.get('total_count', 0)
-        total_count = int(raw_total) if raw_total is not None else 0
 
-        row_data = {}
-        tasks_list = []
-
-        for row in results:
-            task_id = row.get('taskID')
-            # skip any corrupt/empty row
-            if not row or task_id is None:
-                continue
+async def fetch_column_segment_after(
+    cursor, user_id: int, project_id: Optional[int],
+    column_id: int, column_name: str,
+    size: int, page: int, after: Tuple[str, int, int],
+    filters: Optional[TaskListFilters] = None
+) -> ColumnSegment:
+    """
+    Keyset page of one column: seeks past the (rank_key, taskID) in `after`
+    so deep pages cost the same as the first one.
+    """
+    rank_key, task_id, position = after
+    result_sets = await execute_batch(cursor, column_keyset_statements(
+        user_id, project_id, column_id, (rank_key, task_id), size, filters))
 
-            p_name = row.get('projectName') or row.get(
-                'project_name') or "Unknown Project"
-
-            row_data = {
-                "projectID": row.get('projectID'),
-                "taskID": row.get('taskID'),
-                "projectName": p_name,
-                "title": row.get('title'),
-                "priority": row.get('priority'),
-                "status": row.get('status'),
-                "tags": row.get('tags_raw') or "",
-                "columnID": row.get('columnID'),
-                "task_key": row.get('taskKey', f"TSK-{row.get('taskID')}"),
-                "startDate": row.get('start_date') or row.get('startDate'),
-                "endDate": row.get('end_date') or row.get('endDate'),
-                "is_completed": bool(row.get('is_completed', False)),
-                "total_subtasks": row.get('total_subtasks') or 0,
-                "completed_subtasks": row.get('completed_subtasks') or 0,
-            }
+    rows = result_sets[0] if result_sets else []
+    total_rows = result_sets[1] if len(result_sets) > 1 else []
+    total = total_rows[0].get('total_count', 0) if total_rows else 0
 
-            task = TaskGetList(**row_data)
-            task.displayDate = get_display_date(end_date=task.endDate)
-            tasks_list.append(task)
+    return build_column_segment(rows[:size], column_id=column_id, column_name=column_name,
+                                size=size, offset=position, page=page,
+                                total=total, has_more=len(rows) > size)
 
-        has_more = (offset + len(tasks_list)) < total_count
 
-        return ColumnSegment(
-            columnID=column_id,
-            column_name=column_name,
-            page=page,
+async def fetch_all_column_segments(
+    cursor, user_id: int, project_id: Optional[int],
+    db_columns: List[dict], size: int, filters: Optional[TaskListFilters] = None
+) -> Dict[str, ColumnSegment]:
+    """
+    Fetches the first page of every column in a single round trip by sending
+    one multi-statement batch (a page and a count per column) and walking
+    the returned result sets.
+    """
+    if not db_columns:
+        # an empty batch is an empty query, which MySQL rejects
+        return {}
+
+    statements = []
+    for col in db_columns:
+        statements += column_page_statements(user_id, project_id, col["columnID"], size, 0, filters)
+
+    result_sets = await execute_batch(cursor, statements)
+
+    if len(result_sets) != 2 * len(db_columns):
+        logger.warning(
+            f"Batched segment fetch returned {len(result_sets)} result sets "
+            f"for {len(db_columns)} columns, falling back to per-column queries")
+
+        return await fetch_column_segments_concurrently(
+            cursor=cursor,
+            user_id=user_id,
+            project_id=project_id,
+            db_columns=db_columns,
             size=size,
-            total=total_count,
-            has_more=has_more,
-            tasks=tasks_list
+            filters=filters
         )
 
-    except ValidationError as val_err:
-        logger.error(
-            f"Pydantic mapping failed on column segment {column_name}: {str(val_err)}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Database record shape failed parsing validation bounds."
-        )
+    return {
+        str(col["columnID"]): segment_from_result_sets(
+            result_sets[2 * index:2 * index + 2], column_id=col["columnID"],
+            column_name=col["column_name"], size=size, offset=0, page=1, filters=filters)
+        for index, col in enumerate(db_columns)
+    }
+
+
+async def fetch_column_segments_concurrently(
+    cursor, user_id: int, project_id: Optional[int],
+    db_columns: List[dict], size: int, filters: Optional[TaskListFilters] = None
+) -> Dict[str, ColumnSegment]:
+    """
+    Runs the per-column queries in parallel over several pooled
+    connections, or serially on `cursor` when the pool is busy.
+    """
+    def segment_job(col: dict):
+        async def job(job_cursor) -> ColumnSegment:
+            return await fetch_single_column_segment(
+                cursor=job_cursor,
+                user_id=user_id,
+                project_id=project_id,
+                column_id=col["columnID"],
+                column_name=col["column_name"],
+                size=size,
+                offset=0,
+                page=1,
+                filters=filters
+            )
+        return job
+
+    segments = await gather_on_pool([segment_job(col) for col in db_columns],
+                                    fallback_cursor=cursor)
+
+    return {str(col["columnID"]): segment
+            for col, segment in zip(db_columns, segments)}
 
 
 @task_router.post('/', status_code=status.HTTP_201_CREATED)
@@ -161,54 +346,224 @@ async def add_tasks(task: TaskCreateSchema,
 
             t_params = (user_id, task.projectID, task.title, task.description, tags_json_string,
                         task.start_date, task.end_date, task.columnID, task.priorityID)
-            await cursor.callproc('add_task', t_params)
-
-            await conn.commit()
 
-            result = await cursor.fetchone()
+            # task and subtasks share one transaction, committed once below;
+            # the column's last key is locked so concurrent adds don't share it
+            task_rows = await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                (f"""SELECT MAX(rank_key) AS last_key FROM {DB_NAME}.tasks
+                     WHERE userID = %s AND columnID = %s FOR UPDATE""",
+                 (user_id, task.columnID)),
+                ("CALL add_task(%s, %s, %s, %s, %s, %s, %s, %s, %s)", t_params)])
+
+            last_key = task_rows[0][0]['last_key'] if task_rows and task_rows[0] else None
+            result = task_rows[-1][0] if len(task_rows) > 1 and task_rows[-1] else None
+            if not result or result.get('newTaskID') is None:
+                await conn.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to retrieve newly created task.")
 
             new_task_id = result.get('newTaskID')
+            # new cards go to the bottom of their column
+            (rank_key,), respread = await column_append_keys(
+                cursor, user_id, task.columnID, last_key, 1)
+            follow_ups = [
+                (f"UPDATE {DB_NAME}.tasks SET rank_key = %s WHERE userID = %s AND taskID = %s",
+                 (rank_key, user_id, new_task_id)),
+                *sync_task_tags(user_id, "t.taskID = %s", (new_task_id,)),
+                change_log.log_change(
+                    user_id, change_log.TASK, change_log.CREATE, new_task_id, task.projectID)]
+
+            if task.subtasks:
+                subtasks_json_string = json.dumps(
+                    [subtask.model_dump() for subtask in task.subtasks])
+
+                st_params = (user_id, new_task_id, subtasks_json_string)
+
+                follow_ups += [
+                    ("CALL add_subtasks(%s, %s, %s)", st_params),
+                    change_log.log_changes_from(
+                        user_id, change_log.SUBTASK, change_log.CREATE,
+                        f"SELECT subTaskID AS entityID, %s AS projectID FROM {DB_NAME}.sub_tasks WHERE userID = %s AND taskID = %s",
+                        (task.projectID, user_id, new_task_id)),
+                    (f"SELECT subTaskID FROM {DB_NAME}.sub_tasks WHERE userID = %s AND taskID = %s ORDER BY position ASC",
+                     (user_id, new_task_id)),
+                ]
+
+            # the stored card, read back in the same round trip to patch the board cache
+            follow_ups.append(
+                (f"SELECT {TASK_LIST_COLUMNS} {TASK_LIST_FROM} WHERE t.userID = %s AND t.taskID = %s",
+                 (user_id, new_task_id)))
+
+            follow_up_rows = await execute_batch(cursor, follow_ups)
+            task_row = follow_up_rows[-1][0] if follow_up_rows and follow_up_rows[-1] else None
+            subtask_ids = [row['subTaskID']
+                           for row in follow_up_rows[-2]] if task.subtasks else []
 
-            subtasks_json_string = json.dumps(
-                [subtask.model_dump() for subtask in task.subtasks])
-
-            st_params = (user_id, new_task_id, subtasks_json_string)
-
-            await cursor.callproc('add_subtasks', st_params)
             await conn.commit()
+            await data_version.bump(user_id, task.projectID)
+            if respread:
+                await publish_reorder(user_id, respread)
+
+            if task_row is not None:
+                card = {**board_task_from_row(task_row),
+                        "tags": [tag.model_dump() for tag in task.tags]}
+                await board_cache.apply(user_id, upsert_task(
+                    card, task_row['columnID'], task_row['status']))
 
             return JSONResponse(content={
                 "status": 'success',
-                'message': f"Successfully added {len(task.subtasks)} subtasks to task {new_task_id} ", "taskID": new_task_id})
+                'message': f"Successfully added {len(task.subtasks)} subtasks to task {new_task_id} ",
+                "taskID": new_task_id,
+                "subtaskIDs": subtask_ids})
 
-    except Error as e:
-        print(f"Database error: {e}")
+    except DB_ERRORS as e:
+        logger.error(f"Database operation error while creating a task: {str(e)}")
         await conn.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to create task via database engine: {str(e)}")
 
 
+@task_router.post('/import', status_code=status.HTTP_200_OK)
+async def import_tasks(request: Request,
+                       import_format: Optional[str] = Query(
+                           None, alias="format", pattern="^(csv|ndjson)$",
+                           description="csv or ndjson, taken from Content-Type when omitted"),
+                       current_user: TokenData = Depends(get_current_user)):
+    """
+    Imports tasks from a CSV or NDJSON request body, spooled to a temporary
+    file and parsed line by line. Rows take the fields of POST /tasks/
+    (CSV "tags" and "subtasks" cells hold JSON arrays). Replies with an
+    NDJSON stream of rejected rows, progress after every committed chunk
+    and a final summary.
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = task_import.CSV if "csv" in content_type else task_import.NDJSON
+
+    # no session dependency: the import holds its own connection while streaming
+    async with get_session_context(route="import_tasks") as conn:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
+
+    upload = await task_import.spool_body(request.stream())
+
+    async def report():
+        try:
+            async with get_session_context(route="import_tasks",
+                                           writer=request.path_params.get("username")) as conn:
+                async with conn.cursor(cursor=DictCursor) as cursor:
+                    importer = task_import.TaskImporter(conn, cursor, user_id)
+                    records = task_import.parse_records(
+                        import_format, task_import.read_chunks(upload))
+                    async for line in importer.run(records):
+                        yield line
+
+        except (HTTPException, *DB_ERRORS) as e:
+            # the 200 is already out, so the failure goes in the report
+            logger.error(f"Task import for user {user_id} could not start: {e}")
+            yield json.dumps({"event": "aborted", "detail": "Database unavailable, the import stopped."}) + "\n"
+        finally:
+            await upload.close()
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@task_router.get('/export', status_code=status.HTTP_200_OK)
+async def export_tasks(request: Request,
+                       export_format: str = Query(
+                           task_export.NDJSON, alias="format", pattern="^(csv|ndjson)$"),
+                       current_user: TokenData = Depends(get_current_user)):
+    """
+    Streams every task of the user with its tags and subtasks as NDJSON or
+    CSV, in the format POST /tasks/import accepts.
+    """
+    username = request.path_params.get("username")
+
+    # no session dependency: the stream holds its own connection while it runs
+    async with get_session_context(route="export_tasks") as conn:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
+
+    async def body():
+        async with get_session_context(route="export_tasks", pool=await read_pool(username)) as conn:
+            async for chunk in task_export.export_tasks(conn, user_id, export_format):
+                yield chunk
+
+    media_type = "text/csv" if export_format == task_export.CSV else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="tasks.{export_format}"',
+        "Cache-Control": "no-store",
+    })
+
+
+def task_list_filters(
+    filter_date: Optional[date] = Query(None, description="Only tasks due on this day"),
+    due_from: Optional[date] = Query(None, description="Only tasks due on or after this day"),
+    due_to: Optional[date] = Query(None, description="Only tasks due on or before this day"),
+    priority: List[int] = Query([], description="Only tasks with one of these priority ids"),
+    status_ids: List[int] = Query([], alias="status", description="Only segments of these column ids"),
+    tag: Optional[str] = Query(
+        None, min_length=1, max_length=100, description="Only tasks carrying this tag"),
+    completed: Optional[bool] = None,
+    overdue: Optional[bool] = Query(None, description="Past due and not completed"),
+    sort: Literal["position", "due_date", "priority"] = "position",
+    order: Literal["asc", "desc"] = Query("asc", description="Direction of the due_date and priority sorts"),
+) -> TaskListFilters:
+    if filter_date is not None and due_from is None and due_to is None:
+        due_from = due_to = filter_date
+    if due_from is not None and due_to is not None and due_from > due_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="due_from must not be after due_to.")
+
+    return TaskListFilters(due_from=due_from, due_to=due_to, priority=priority,
+                           status=status_ids, tag=tag, completed=completed,
+                           overdue=overdue, sort=sort, order=order)
+
+
 @task_router.get('/list', status_code=status.HTTP_200_OK, response_model=SegmentedTasksResponse)
 async def get_tasks_list(
+    request: Request,
+    response: Response,
     current_user: TokenData = Depends(get_current_user),
-    conn: Connection = Depends(get_session),
+    conn: Connection = Depends(get_read_session),
     project_id: Optional[int] = None,
     column_id: Optional[int] = Query(
         None, description="The specific column segment to fetch"),
-    filter_date: Optional[date] = None,
     page: int = Query(1, ge=1),
-    size: int = Query(10, ge=1, le=100)
+    size: int = Query(10, ge=1, le=100),
+    page_cursor: Optional[str] = Query(
+        None, alias="cursor", description="next_cursor of the previous chunk, requires column_id"),
+    filters: TaskListFilters = Depends(task_list_filters)
 ):
-    # active_filter_date = filter_date or date.today()
     offset = (page - 1) * size
 
+    if page_cursor is not None and column_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A pagination cursor is only valid together with column_id."
+        )
+
+    if page_cursor is not None and not keyset_pages(filters):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursors only page the position sort, use page for other sorts."
+        )
+
     try:
-        async with conn.cursor(cursor=DictCursor) as cursor:
-            params = (current_user.sub, '')
-            user_id = await users.get_user_id(cursor, params)
+        # a 304 is answered before a cursor checks out a pool connection
+        user_id = await users.get_session_user_id(conn, current_user.sub)
 
-            await cursor.execute("SELECT columnID, column_name FROM kanban_columns ORDER BY columnID ASC;")
-            db_columns = await cursor.fetchall()
+        unchanged = await data_version.not_modified(
+            request, response, user_id, project_id, "list",
+            fresh=not conn.on_replica)
+        if unchanged is not None:
+            return unchanged
+
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            db_columns = await kanban_columns.get_columns(cursor)
 
             if not db_columns:
                 raise HTTPException(
@@ -226,16 +581,30 @@ async def get_tasks_list(
                         detail=f"Requested column ID {column_id} does not exist in workflow configurations."
                     )
 
-                segment_payload = await fetch_single_column_segment(
-                    cursor=cursor,
-                    user_id=user_id,
-                    project_id=project_id,
-                    column_id=col_data["columnID"],
-                    column_name=col_data["column_name"],
-                    size=size,
-                    offset=offset,
-                    page=page
-                )
+                if page_cursor is not None:
+                    segment_payload = await fetch_column_segment_after(
+                        cursor=cursor,
+                        user_id=user_id,
+                        project_id=project_id,
+                        column_id=col_data["columnID"],
+                        column_name=col_data["column_name"],
+                        size=size,
+                        page=page,
+                        after=decode_cursor(page_cursor),
+                        filters=filters
+                    )
+                else:
+                    segment_payload = await fetch_single_column_segment(
+                        cursor=cursor,
+                        user_id=user_id,
+                        project_id=project_id,
+                        column_id=col_data["columnID"],
+                        column_name=col_data["column_name"],
+                        size=size,
+                        offset=offset,
+                        page=page,
+                        filters=filters
+                    )
 
                 return SegmentedTasksResponse(
                     projectID=project_id,
@@ -247,27 +616,27 @@ async def get_tasks_list(
                 f"user_id={user_id} ({type(user_id)}), "
                 f"project_id={project_id} ({type(project_id)}), "
                 f"col_id={column_id} ({type(column_id)}), "
-                f"filter_date={filter_date} ({type(filter_date)})"
+                f"filters={filters}"
             )
 
-            segments_map: Dict[str, ColumnSegment] = {}
-
-            # Execute sequentially over the single connection/cursor
-            for col in db_columns:
-                current_col_id = col["columnID"]
-                current_col_name = col["column_name"]
-
-                segment_payload = await fetch_single_column_segment(
-                    cursor=cursor,
-                    user_id=user_id,
-                    project_id=project_id,
-                    column_id=current_col_id,
-                    column_name=current_col_name,
-                    size=size,
-                    offset=0,
-                    page=1
-                )
-                segments_map[str(current_col_id)] = segment_payload
+            if filters.status:
+                unknown = set(filters.status) - {col["columnID"] for col in db_columns}
+                if unknown:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Requested column IDs {sorted(unknown)} do not exist in workflow configurations."
+                    )
+                db_columns = [col for col in db_columns if col["columnID"] in filters.status]
+
+            # One round trip for the first page of every column
+            segments_map = await fetch_all_column_segments(
+                cursor=cursor,
+                user_id=user_id,
+                project_id=project_id,
+                db_columns=db_columns,
+                size=size,
+                filters=filters
+            )
 
             return SegmentedTasksResponse(
                 projectID=project_id,
@@ -285,96 +654,474 @@ async def get_tasks_list(
         )
 
 
-@task_router.get('/board', status_code=status.HTTP_200_OK, response_model=List[TasksResponseKanban])
-async def get_tasks_board(conn: Connection = Depends(get_session),
-                          current_user: TokenData = Depends(get_current_user),
-                          project_id: Optional[int] = None):
+@task_router.get('/search', status_code=status.HTTP_200_OK, response_model=TaskSearchResponse)
+async def search_tasks(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in titles and descriptions"),
+    project_id: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    current_user: TokenData = Depends(get_current_user),
+    conn: Connection = Depends(get_read_session),
+):
+    terms = search_terms(q)
+    if terms is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search for at least one word of {FULLTEXT_MIN_TOKEN} or more characters.")
 
     try:
+        user_id = await users.get_session_user_id(conn, current_user.sub)
+
+        unchanged = await data_version.not_modified(
+            request, response, user_id, project_id, "search",
+            fresh=not conn.on_replica)
+        if unchanged is not None:
+            return unchanged
+
         async with conn.cursor(cursor=DictCursor) as cursor:
-            params = (current_user.sub, '')
-            user_id = await users.get_user_id(cursor, params)
-            logger.info(f"user_id current {user_id}")
-            if project_id is not None:
-                proc_name = "get_kanban_by_project"
-                proc_params = (user_id, project_id)
-            else:
-                proc_name = "get_kanban_all_projects"
-                proc_params = (user_id,)
+            await cursor.execute(*search_statement(user_id, project_id, terms, size, (page - 1) * size))
+            rows = await cursor.fetchall()
 
-            await cursor.callproc(proc_name, proc_params)
+            return TaskSearchResponse(
+                query=q, page=page, size=size, has_more=len(rows) > size,
+                tasks=[list_task_from_row(row, None) for row in rows[:size]])
 
-            results = await cursor.fetchall()
-            board_map = {}
+    except ValidationError as e:
+        logger.error(f"Pydantic mapping failed on search results: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Database record shape failed parsing validation bounds.")
 
-            for row in results:
-                col_id = row.get('columnID')
+    except DB_ERRORS as e:
+        logger.error(f"Database operation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while searching tasks. {str(e)}")
 
-                if col_id is None:
-                    continue
 
-                if col_id not in board_map:
-                    board_map[col_id] = {
-                        "columnID": col_id,
-                        "column_name": row.get('status'),
-                        "tasks": []
-                    }
-
-                task_id = row.get('taskID')
-
-                if task_id is not None:
-                    
-                    end_date = row.get('end_date')
-                    display_date = get_display_date(end_date=end_date)
-                    
-                    board_map[col_id]["tasks"].append({
-                        "projectID": row.get('projectID'),
-                        "taskID": row.get('taskID'),
-                        "project_name": row.get('project_name'),
-                        "title": row.get('title'),
-                        "description": row.get('description'),
-                        "tags": row.get('tags'),
-                        "position": row.get('position'),
-                        "task_key": row.get('taskKey', f"TSK-{row.get('taskID')}"),
-                        "is_completed": row.get('is_completed'),
-                        "priority": row.get('priority'),
-                        "start_date": row.get('start_date'),
-                        "end_date": end_date,
-                        "total_subtasks": row.get('total_subtasks'),
-                        "completed_subtasks": row.get('completed_subtasks'),
-                        "display_date": display_date
-                    })
-            logger.debug(f"Board map {board_map} - {results}")
-            return list(board_map.values())
-
-    except Error as e:
+@task_router.get('/board', status_code=status.HTTP_200_OK, response_model=List[TasksResponseKanban])
+async def get_tasks_board(request: Request,
+                          response: Response,
+                          conn: Connection = Depends(get_read_session),
+                          current_user: TokenData = Depends(get_current_user),
+                          project_id: Optional[int] = None,
+                          tag: Optional[str] = Query(
+                              None, min_length=1, max_length=100, description="Only tasks carrying this tag")):
+
+    try:
+        # 304s and snapshot hits are answered before a cursor checks out a
+        # pool connection
+        user_id = await users.get_session_user_id(conn, current_user.sub)
+        logger.info(f"user_id current {user_id}")
+
+        # snapshots hold the unfiltered board and are kept for hours, so
+        # they are built from the primary rather than a lagging replica
+        snapshot = tag is None
+        unchanged = await data_version.not_modified(
+            request, response, user_id, project_id, "board",
+            fresh=snapshot or not conn.on_replica)
+        if unchanged is not None:
+            return unchanged
+
+        if snapshot:
+            cached_board = await board_cache.get(user_id, project_id)
+            if cached_board is not None:
+                return cached_board
+
+        # read before the query so a mutation landing meanwhile keeps
+        # this (possibly stale) board out of the cache
+        generation = await board_cache.generation(user_id)
+
+        async with primary_session(conn, needed=snapshot) as session:
+            async with session.cursor(cursor=DictCursor) as cursor:
+                column_names = await kanban_columns.get_names(cursor)
+
+                results, tag_rows = await execute_batch(cursor, board_statements(user_id, project_id, tag))
+                board = build_board(results, column_names, group_tags(tag_rows))
+                logger.debug(f"Board map {board} - {results}")
+
+        if snapshot:
+            await board_cache.store(user_id, project_id, board, generation)
+        return board
+
+    except DB_ERRORS as e:
         logger.error(f"Database operation error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while fetching kanban columns. {str(e)}")
 
 
+async def fetch_changed_entities(cursor, user_id: int, changed: Dict[str, List[int]]):
+    """Current rows of the changed tasks, subtasks and projects in one round trip."""
+    queries = {
+        change_log.TASK: f"SELECT {TASK_LIST_COLUMNS} {TASK_LIST_FROM} WHERE t.userID = %s AND t.taskID IN %s",
+        change_log.SUBTASK: f"""SELECT subTaskID, taskID, title, is_completed, position
+                                FROM {DB_NAME}.sub_tasks WHERE userID = %s AND subTaskID IN %s""",
+        change_log.PROJECT: f"""SELECT projectID, project_name, color
+                                FROM {DB_NAME}.projects WHERE userID = %s AND projectID IN %s""",
+    }
+    entities = [entity for entity in queries if changed.get(entity)]
+    rows: Dict[str, list] = {entity: [] for entity in queries}
+    if not entities:
+        return rows
+
+    result_sets = await execute_batch(cursor, [
+        (queries[entity], (user_id, tuple(changed[entity]))) for entity in entities])
+    rows.update(zip(entities, result_sets))
+    return rows
+
+
+@task_router.get('/changes', status_code=status.HTTP_200_OK, response_model=ChangesResponse)
+async def get_changes(conn: Connection = Depends(get_read_session),
+                      current_user: TokenData = Depends(get_current_user),
+                      since: int = Query(0, ge=0, description="version returned by the previous call")):
+    """
+    Tasks, subtasks and projects created, updated, reordered or deleted after
+    change sequence `since`. Deleting a project or task also removes its
+    tasks or subtasks on the client. With full_resync set the client refetches
+    the board and continues from `version`.
+    """
+    try:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
+
+            entries, horizon, latest = await change_log.read_changes(
+                cursor, user_id, since, CHANGES_MAX_ENTRIES)
+
+            if entries is None or since < horizon:
+                return ChangesResponse(version=latest, full_resync=True)
+
+            changed = change_log.group_entries(entries)
+            rows = await fetch_changed_entities(cursor, user_id, changed)
+
+            # whatever is logged but gone now was deleted, whichever op came last
+            task_rows = rows[change_log.TASK]
+            subtask_rows = rows[change_log.SUBTASK]
+            project_rows = rows[change_log.PROJECT]
+            live_tasks = {row['taskID'] for row in task_rows}
+            live_subtasks = {row['subTaskID'] for row in subtask_rows}
+            live_projects = {row['projectID'] for row in project_rows}
+
+            return ChangesResponse(
+                version=max(latest, since),
+                tasks=[board_task_from_row(row) for row in task_rows],
+                deleted_tasks=[task_id for task_id in changed[change_log.TASK]
+                               if task_id not in live_tasks],
+                subtasks=subtask_rows,
+                deleted_subtasks=[subtask_id for subtask_id in changed[change_log.SUBTASK]
+                                  if subtask_id not in live_subtasks],
+                projects=project_rows,
+                deleted_projects=[project_id for project_id in changed[change_log.PROJECT]
+                                  if project_id not in live_projects],
+            )
+
+    except DB_ERRORS as e:
+        logger.error(f"Database operation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while fetching changes. {str(e)}")
+
+
+@task_router.get('/events', status_code=status.HTTP_200_OK)
+async def stream_board_events(request: Request,
+                              current_user: TokenData = Depends(get_current_user)):
+    """
+    Server-Sent Events stream of board changes made by this user from any
+    tab, device or API instance. A "changed" event names the project; the
+    client then pulls /changes. "resync" means events were dropped.
+    """
+    # no session dependency: it would hold a connection for the whole stream
+    async with get_session_context(route="stream_board_events") as conn:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
+
+    connection = await board_events.connect(user_id)
+
+    async def event_stream():
+        try:
+            yield f"retry: {HEARTBEAT_INTERVAL * 1000}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(connection.queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    # keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: board\ndata: {event}\n\n"
+        finally:
+            await board_events.disconnect(connection)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
+async def reorder_tasks(cursor, user_id: int, moves: List[KanbanReorderSchema]):
+    """
+    Applies card moves in order inside the caller's transaction. Only the
+    moved cards get a new rank key, so a move costs one row update however
+    long the column is. A move's newPosition indexes the column as the
+    board shows it: all of the user's cards, or only those of its projectId. Returns the rows that changed and the resulting
+    positions of every column the moves touched. Raises 404 unless all
+    moved tasks belong to the user.
+    """
+    task_ids = tuple({move.taskID for move in moves})
+    destinations = tuple({move.destination_column_id for move in moves})
+
+    # locks the source and destination columns so concurrent moves can't
+    # hand out the same key
+    result_sets = await execute_batch(cursor, [
+        *change_log.next_sequence(user_id),
+        (f"""SELECT taskID, projectID, columnID, rank_key FROM {DB_NAME}.tasks
+             WHERE userID = %s AND (columnID IN %s OR columnID IN (
+                 SELECT columnID FROM (
+                     SELECT columnID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID IN %s
+                 ) AS moved))
+             ORDER BY columnID, rank_key, position, taskID
+             FOR UPDATE""",
+         (user_id, destinations, user_id, task_ids)),
+    ])
+    rows = result_sets[-1] if result_sets else []
+    if not set(task_ids) <= {row['taskID'] for row in rows}:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more tasks to move were not found.")
+
+    columns: Dict[int, List[dict]] = {column_id: [] for column_id in destinations}
+    for row in rows:
+        columns.setdefault(row['columnID'], []).append(row)
+
+    changed_ids = apply_moves(columns, [(move.taskID, move.destination_column_id,
+                                         move.new_position, move.projectID) for move in moves])
+    changed = [row for row in rows if row['taskID'] in changed_ids]
+
+    await execute_batch(cursor, [
+        *[(f"UPDATE {DB_NAME}.tasks SET columnID = %s, rank_key = %s WHERE userID = %s AND taskID = %s",
+           (row['columnID'], row['rank_key'], user_id, row['taskID'])) for row in changed],
+        *[change_log.log_change(user_id, change_log.TASK, change_log.REORDER,
+                                row['taskID'], row['projectID']) for row in changed],
+    ])
+
+    # positions count what the client's board shows, like newPosition does
+    scopes = {move.projectID for move in moves}
+    scope = scopes.pop() if len(scopes) == 1 else None
+    positions = [{"taskID": row['taskID'], "columnID": column_id,
+                  "position": index, "rank_key": row['rank_key']}
+                 for column_id, column_rows in columns.items()
+                 for index, row in enumerate(
+                     [row for row in column_rows if scope is None or row['projectID'] == scope])]
+    return changed, positions
+
+
+async def publish_reorder(user_id: int, changed: List[dict]) -> None:
+    for project_id in {row['projectID'] for row in changed}:
+        await data_version.bump(user_id, project_id)
+    await board_cache.apply(user_id, set_ranks(changed))
+
+
 @task_router.patch('/board/reorder')
 async def reorder_board(payload: KanbanReorderSchema,
                         conn: Connection = Depends(get_session),
-                        _: TokenData = Depends(get_current_user)):
+                        current_user: TokenData = Depends(get_current_user)):
 
     try:
         async with conn.cursor(cursor=DictCursor) as cursor:
-            params = (payload.taskID, payload.destination_column_id,
-                      payload.new_position)
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
 
-            await cursor.callproc('reorder_kanban_tasks', params)
+            changed, _ = await reorder_tasks(cursor, user_id, [payload])
             await conn.commit()
 
+            await publish_reorder(user_id, changed)
+
             return {"status": "success", "message": "Task card shifted successfully"}
 
-    except Error as e:
+    except HTTPException:
+        # releasing a connection mid-transaction would discard it
+        await conn.rollback()
+        raise
+
+    except DB_ERRORS as e:
         await conn.rollback()
         logger.error(f"Database operation error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while reordering kanban column. {str(e)}")
 
 
+@task_router.patch('/board/reorder/batch', status_code=status.HTTP_200_OK, response_model=KanbanReorderBatchResponse)
+async def reorder_board_batch(payload: KanbanReorderBatchSchema,
+                              conn: Connection = Depends(get_session),
+                              current_user: TokenData = Depends(get_current_user)):
+
+    try:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
+
+            # all moves share one checkout, two round trips and one commit
+            changed, positions = await reorder_tasks(cursor, user_id, payload.moves)
+            await conn.commit()
+
+            await publish_reorder(user_id, changed)
+
+            return KanbanReorderBatchResponse(status="success", positions=positions)
+
+    except HTTPException:
+        # releasing a connection mid-transaction would discard it
+        await conn.rollback()
+        raise
+
+    except DB_ERRORS as e:
+        await conn.rollback()
+        logger.error(f"Database operation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while reordering kanban columns. {str(e)}")
+
+
+OWNED_TASKS_QUERY = f"SELECT taskID AS entityID, projectID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID IN %s"
+
+
+async def bulk_move_tasks(cursor, user_id: int, task_ids: tuple,
+                          column_id: int) -> Tuple[List[dict], List[dict]]:
+    """
+    Moves the tasks to the bottom of `column_id`, keeping their current
+    order, with one UPDATE. Cards already in the column stay where they are,
+    unless the column is respread to make room. Returns the moved rows and
+    the rows the respread rewrote.
+    """
+    result_sets = await execute_batch(cursor, [
+        *change_log.next_sequence(user_id),
+        (f"""SELECT taskID, projectID, columnID, rank_key FROM {DB_NAME}.tasks
+             WHERE userID = %s AND taskID IN %s
+             ORDER BY columnID, rank_key, taskID FOR UPDATE""", (user_id, task_ids)),
+        (f"""SELECT MAX(rank_key) AS last_key FROM {DB_NAME}.tasks
+             WHERE userID = %s AND columnID = %s FOR UPDATE""", (user_id, column_id)),
+    ])
+    rows, last_key = result_sets[-2], result_sets[-1][0]['last_key']
+    if len(rows) != len(task_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more tasks were not found.")
+
+    moved = [row for row in rows if row['columnID'] != column_id]
+    if not moved:
+        return [], []
+    keys, respread = await column_append_keys(cursor, user_id, column_id, last_key, len(moved))
+    for row, key in zip(moved, keys):
+        row['rank_key'] = key
+        row['columnID'] = column_id
+
+    moved_ids = tuple(row['taskID'] for row in moved)
+    cases = " ".join(["WHEN %s THEN %s"] * len(moved))
+    await execute_batch(cursor, [
+        (f"""UPDATE {DB_NAME}.tasks SET columnID = %s, rank_key = CASE taskID {cases} END
+             WHERE userID = %s AND taskID IN %s""",
+         (column_id, *[value for row in moved for value in (row['taskID'], row['rank_key'])],
+          user_id, moved_ids)),
+        change_log.log_changes_from(user_id, change_log.TASK, change_log.REORDER,
+                                    OWNED_TASKS_QUERY, (user_id, moved_ids)),
+    ])
+    return moved, respread
+
+
+@task_router.post('/bulk', status_code=status.HTTP_200_OK, response_model=TaskBulkResponse)
+async def bulk_update_tasks(payload: TaskBulkSchema,
+                            conn: Connection = Depends(get_session),
+                            current_user: TokenData = Depends(get_current_user)):
+    """
+    Applies one operation to many tasks: delete, move to a column, set the
+    priority or replace the tags. Each runs as a single set-based statement
+    restricted to the user's rows, all or nothing: an id that isn't the
+    user's task fails the request with 404.
+    """
+    task_ids = tuple(payload.taskIDs)
+
+    try:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            user_id = await users.get_user_id(cursor, (current_user.sub, ''))
+
+            if payload.operation == "move":
+                if payload.columnID not in await kanban_columns.get_names(cursor):
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Column {payload.columnID} not found.")
+                moved, respread = await bulk_move_tasks(cursor, user_id, task_ids, payload.columnID)
+                await conn.commit()
+                if moved:
+                    await publish_reorder(user_id, moved + respread)
+                return TaskBulkResponse(status="success", operation=payload.operation,
+                                        affected=len(moved), taskIDs=[row['taskID'] for row in moved])
+
+            owned = (OWNED_TASKS_QUERY + " FOR UPDATE", (user_id, task_ids))
+            if payload.operation == "delete":
+                # tombstones are logged before the rows go
+                statements = [
+                    owned,
+                    change_log.log_changes_from(user_id, change_log.TASK, change_log.DELETE,
+                                                OWNED_TASKS_QUERY, (user_id, task_ids)),
+                    (f"DELETE FROM {DB_NAME}.tasks WHERE userID = %s AND taskID IN %s",
+                     (user_id, task_ids)),
+                ]
+            elif payload.operation == "set_priority":
+                statements = [
+                    owned,
+                    (f"SELECT priority_name FROM {DB_NAME}.priorities WHERE priorityID = %s",
+                     (payload.priorityID,)),
+                    (f"""UPDATE {DB_NAME}.tasks t
+                         INNER JOIN {DB_NAME}.priorities pr ON pr.priorityID = %s
+                         SET t.priorityID = pr.priorityID
+                         WHERE t.userID = %s AND t.taskID IN %s""",
+                     (payload.priorityID, user_id, task_ids)),
+                ]
+            else:
+                tags = [tag.model_dump() for tag in payload.tags]
+                statements = [
+                    owned,
+                    (f"UPDATE {DB_NAME}.tasks SET tags = %s WHERE userID = %s AND taskID IN %s",
+                     (json.dumps(tags), user_id, task_ids)),
+                    *sync_task_tags(user_id, "t.taskID IN %s", (task_ids,)),
+                ]
+            if payload.operation != "delete":
+                statements.append(change_log.log_changes_from(
+                    user_id, change_log.TASK, change_log.UPDATE, OWNED_TASKS_QUERY, (user_id, task_ids)))
+
+            result_sets = await execute_batch(cursor, [*change_log.next_sequence(user_id), *statements])
+            rows = result_sets[0]
+            if len(rows) != len(task_ids):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="One or more tasks were not found.")
+            if payload.operation == "set_priority" and not result_sets[1]:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Priority {payload.priorityID} not found.")
+
+            await conn.commit()
+
+            for project_id in {row['projectID'] for row in rows}:
+                await data_version.bump(user_id, project_id)
+            if payload.operation == "delete":
+                patches = [remove_task(task_id) for task_id in task_ids]
+            elif payload.operation == "set_priority":
+                priority = result_sets[1][0]['priority_name']
+                patches = [update_task_fields(task_id, priority=priority) for task_id in task_ids]
+            else:
+                patches = [update_task_fields(task_id, tags=tags) for task_id in task_ids]
+            await board_cache.apply(user_id, *patches)
+
+            return TaskBulkResponse(status="success", operation=payload.operation,
+                                    affected=len(rows), taskIDs=list(task_ids))
+
+    except HTTPException:
+        # releasing a connection mid-transaction would discard it
+        await conn.rollback()
+        raise
+
+    except DB_ERRORS as e:
+        await conn.rollback()
+        logger.error(f"Database operation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while updating tasks. {str(e)}")
+
+
 @task_router.put('/{task_id}')
 async def update_task(task_id: int,
                       task: TaskCreateSchema,
@@ -397,7 +1144,7 @@ async def update_task(task_id: int,
 
             return JSONResponse(content={'message': f'Task {task_id} successfully updated'})
 
-    except Error as e:
+    except DB_ERRORS as e:
         print(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -417,8 +1164,8 @@ async def update_tags(task_id: int,
             params = (current_user.sub, '')
             user_id = await users.get_user_id(cursor, params)
 
-            tags_json_string = json.dumps(
-                [tag.model_dump() for tag in payload.tags])
+            tags = [tag.model_dump() for tag in payload.tags]
+            tags_json_string = json.dumps(tags)
             logger.info(f'Create new tags {tags_json_string}')
 
             query = f"""
@@ -426,16 +1173,30 @@ async def update_tags(task_id: int,
                 WHERE userID = %s AND taskID = %s;
             """
 
-            await cursor.execute(query, (tags_json_string, user_id, task_id))
+            project_rows = await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                (query, (tags_json_string, user_id, task_id)),
+                *sync_task_tags(user_id, "t.taskID = %s", (task_id,)),
+                change_log.log_changes_from(
+                    user_id, change_log.TASK, change_log.UPDATE,
+                    f"SELECT taskID AS entityID, projectID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID = %s",
+                    (user_id, task_id)),
+                (f"SELECT projectID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID = %s",
+                 (user_id, task_id)),
+            ])
 
             await conn.commit()
 
+            if project_rows and project_rows[-1]:
+                await data_version.bump(user_id, project_rows[-1][0]['projectID'])
+            await board_cache.apply(user_id, update_task_fields(task_id, tags=tags))
+
             return {
                 "status": "success",
                 "message": f"Successfully added {len(payload.tags)} tags to task {task_id} for user {user_id}."
             }
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -455,16 +1216,27 @@ async def delete_task(task_id: int,
             params = (current_user.sub, '')
             user_id = await users.get_user_id(cursor, params)
 
-            await cursor.execute(query, (user_id, task_id, payload.projectID))
+            await execute_batch(cursor, [
+                *change_log.next_sequence(user_id),
+                # tombstone logged before the row goes, only if it's the user's
+                change_log.log_changes_from(
+                    user_id, change_log.TASK, change_log.DELETE,
+                    f"SELECT taskID AS entityID, projectID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID = %s AND projectID = %s",
+                    (user_id, task_id, payload.projectID)),
+                (query, (user_id, task_id, payload.projectID)),
+            ])
 
             await conn.commit()
+            await data_version.bump(user_id, payload.projectID)
+
+            await board_cache.apply(user_id, remove_task(task_id))
 
             return {
                 "status": "success",
                 "message": f"Successfully deleted  task {task_id}."
             }
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database error: {str(e)}")
         await conn.rollback()
         raise HTTPException(
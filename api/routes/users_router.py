@@ -11,10 +11,10 @@ from fastapi.responses import JSONResponse
 from asyncmy.connection import Connection  # type: ignore
 from asyncmy.cursors import DictCursor  # type: ignore
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from mysql.connector import Error
+from api.db.resilience import DB_ERRORS
 from api.auth import REFRESH_TOKEN_COOKIE_NAME, REFRESH_TOKEN_DOMAIN, auth_token_response
 from api.compress_profile_img import process_profile_img
-from api.db.database import DB_NAME, get_session, get_session_context
+from api.db.database import DB_NAME, get_read_session, get_session, get_session_context
 from api.config import settings
 from api.db.redis_backend import (get_redis, get_redis_context)
 from api.models.entities import (TokenData, UploadResponse, UserChangePassword,
@@ -109,7 +109,7 @@ async def upload_to_cloudinary(file_bytes: bytes, user_id: int):
 
 
 @user_router.get('/profile', status_code=status.HTTP_200_OK, response_model=UserGet)
-async def get_user_profile(conn: Connection = Depends(get_session),
+async def get_user_profile(conn: Connection = Depends(get_read_session),
                            current_user: TokenData = Depends(get_current_user)):
     try:
         async with conn.cursor(cursor=DictCursor) as cursor:
@@ -144,7 +144,7 @@ async def get_user_profile(conn: Connection = Depends(get_session),
 
             return UserGet(**user_map)
 
-    except Error as e:
+    except DB_ERRORS as e:
         print(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -243,7 +243,7 @@ async def edit_profile(user: UserUpdate,
                 await redis_client.setex(KEY, JTI_EXPIRY, 'REVOKED')
                 logger.info(f'{KEY} successfully revoked')
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
@@ -295,7 +295,7 @@ async def change_user_password(user: UserChangePassword,
             CACHE_KEY = f"user:{current_user.sub}:token_v"
             await redis_client.setex(CACHE_KEY, 604800, new_version)
 
-    except Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database error: {e}")
         await conn.rollback()
         raise HTTPException(
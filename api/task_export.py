@@ -0,0 +1,100 @@
+import csv
+from datetime import datetime
+import io
+import json
+from typing import AsyncGenerator, List
+
+from asyncmy.cursors import SSDictCursor  # type: ignore
+from api.config import settings
+from api.db.database import DB_NAME
+
+EXPORT_FETCH_ROWS = settings.EXPORT_FETCH_ROWS
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+# the fields POST /tasks/import reads come first, so an export re-imports as is
+EXPORT_FIELDS = ["title", "description", "projectID", "columnID", "priorityID",
+                 "start_date", "end_date", "tags", "subtasks", "taskID",
+                 "project_name", "status", "priority", "is_completed"]
+
+# Subtasks are folded into their task's row, so one unbuffered result set
+# carries everything. The order follows idx_tasks_user_project_column_rank,
+# which lets MySQL stream rows without sorting them first.
+EXPORT_QUERY = f"""
+    SELECT t.taskID, t.projectID, p.project_name, t.title, t.description,
+           t.columnID, kc.column_name AS status, t.priorityID,
+           pr.priority_name AS priority, t.start_date, t.end_date,
+           t.is_completed, t.tags AS tags_raw,
+           (SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                'title', st.title, 'is_completed', st.is_completed,
+                'position', st.position))
+            FROM {DB_NAME}.sub_tasks st WHERE st.taskID = t.taskID) AS subtasks_raw
+    FROM {DB_NAME}.tasks t
+    INNER JOIN {DB_NAME}.projects p ON p.projectID = t.projectID
+    INNER JOIN {DB_NAME}.kanban_columns kc ON kc.columnID = t.columnID
+    LEFT JOIN {DB_NAME}.priorities pr ON pr.priorityID = t.priorityID
+    WHERE t.userID = %s
+    ORDER BY t.projectID, t.columnID, t.rank_key, t.taskID
+"""
+
+
+def _json_list(raw) -> list:
+    if not raw:
+        return []
+    try:
+        value = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def export_row(row: dict) -> dict:
+    subtasks = sorted(_json_list(row.get('subtasks_raw')),
+                      key=lambda subtask: subtask.get('position') or 0)
+    record = {key: row.get(key) for key in EXPORT_FIELDS if key not in ("tags", "subtasks")}
+    record["tags"] = _json_list(row.get('tags_raw'))
+    record["subtasks"] = [{"title": subtask.get('title'),
+                           "is_completed": bool(subtask.get('is_completed'))}
+                          for subtask in subtasks]
+    record["is_completed"] = bool(row.get('is_completed'))
+    for key in ("start_date", "end_date"):
+        if isinstance(record[key], datetime):
+            record[key] = record[key].isoformat()
+    return record
+
+
+def _csv_lines(records: List[dict], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    if header:
+        writer.writeheader()
+    for record in records:
+        writer.writerow({**record, "tags": json.dumps(record["tags"]),
+                         "subtasks": json.dumps(record["subtasks"])})
+    return buffer.getvalue()
+
+
+async def export_tasks(conn, user_id: int, fmt: str) -> AsyncGenerator[str, None]:
+    """
+    Every task of the user with its tags and subtasks, read through an
+    unbuffered cursor EXPORT_FETCH_ROWS rows at a time. Only one batch of
+    rows is ever held in memory, whatever the number of tasks.
+    """
+    async with conn.cursor(cursor=SSDictCursor) as cursor:
+        await cursor.execute(EXPORT_QUERY, (user_id,))
+        header = fmt == CSV
+        while True:
+            rows = await cursor.fetchmany(EXPORT_FETCH_ROWS)
+            if not rows:
+                break
+            records = [export_row(row) for row in rows]
+            if fmt == CSV:
+                yield _csv_lines(records, header)
+                header = False
+            else:
+                yield "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+        if header:
+            # nothing to export, still a valid CSV
+            yield _csv_lines([], header)
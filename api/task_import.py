@@ -0,0 +1,323 @@
+import codecs
+import csv
+import json
+import logging
+from tempfile import SpooledTemporaryFile
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from api.board_cache import board_cache
+from api.config import settings
+from api.data_version import data_version
+from api.db import change_log
+from api.db.column_cache import kanban_columns
+from api.db.database import DB_NAME, execute_batch
+from api.db.rank_rebalancer import column_append_keys
+from api.db.resilience import DB_ERRORS
+from api.db.tag_index import sync_task_tags
+from api.models.entities import TaskCreateSchema
+
+logger = logging.getLogger("users_logger")
+
+IMPORT_CHUNK_ROWS = settings.IMPORT_CHUNK_ROWS
+IMPORT_MAX_ERRORS = settings.IMPORT_MAX_ERRORS
+IMPORT_MAX_LINE_BYTES = settings.IMPORT_MAX_LINE_BYTES
+IMPORT_SPOOL_BYTES = settings.IMPORT_SPOOL_BYTES
+IMPORT_READ_BYTES = 65536
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+# CSV cells holding JSON arrays, the same shape as the NDJSON fields
+JSON_CELLS = ("tags", "subtasks")
+
+
+class ImportFormatError(ValueError):
+    """The upload can't be parsed any further."""
+
+
+async def spool_body(chunks: AsyncIterator[bytes]) -> UploadFile:
+    """
+    Copies the request body into a temporary file, in memory up to
+    IMPORT_SPOOL_BYTES and on disk past that. Done before the response
+    starts: once it has, servers on ASGI spec < 2.4 hand the body messages
+    to Starlette's disconnect listener instead of the stream.
+    """
+    upload = UploadFile(SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES))
+    try:
+        async for chunk in chunks:
+            await upload.write(chunk)
+        await upload.seek(0)
+    except BaseException:
+        await upload.close()
+        raise
+    return upload
+
+
+async def read_chunks(upload: UploadFile) -> AsyncGenerator[bytes, None]:
+    while True:
+        chunk = await upload.read(IMPORT_READ_BYTES)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncGenerator[str, None]:
+    """
+    Decodes an UTF-8 byte stream into lines (newline kept) as it arrives,
+    holding at most one line in memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="strict")
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            while True:
+                end = pending.find("\n")
+                if end < 0:
+                    break
+                line, pending = pending[:end + 1], pending[end + 1:]
+                yield line
+            if len(pending) > IMPORT_MAX_LINE_BYTES:
+                raise ImportFormatError(f"Line longer than {IMPORT_MAX_LINE_BYTES} characters.")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ImportFormatError("The file is not valid UTF-8.")
+    if pending:
+        yield pending
+
+
+async def ndjson_records(lines: AsyncIterator[str]) -> AsyncGenerator[Tuple[int, object], None]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ImportFormatError(f"Invalid JSON: {e}")
+
+
+async def csv_records(lines: AsyncIterator[str]) -> AsyncGenerator[Tuple[int, object], None]:
+    """
+    CSV rows as dicts keyed by the header row. A quoted cell may span
+    lines, so lines are joined until their quotes balance.
+    """
+    header: Optional[List[str]] = None
+    record, record_line, line_number = "", 0, 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            record_line = line_number
+        record += line
+        if record.count('"') % 2:
+            if len(record) > IMPORT_MAX_LINE_BYTES:
+                raise ImportFormatError(f"Unterminated quoted cell on line {record_line}.")
+            continue
+
+        text, record = record, ""
+        if not text.strip():
+            continue
+        cells = next(csv.reader([text]))
+        if header is None:
+            header = [cell.strip() for cell in cells]
+            continue
+        if len(cells) != len(header):
+            yield record_line, ImportFormatError(
+                f"Expected {len(header)} cells, found {len(cells)}.")
+            continue
+
+        row: Dict[str, object] = {}
+        for name, cell in zip(header, cells):
+            if cell == "":
+                continue
+            if name in JSON_CELLS:
+                try:
+                    row[name] = json.loads(cell)
+                except ValueError:
+                    yield record_line, ImportFormatError(f"Cell '{name}' is not a JSON array.")
+                    break
+            else:
+                row[name] = cell
+        else:
+            yield record_line, row
+
+    if record:
+        raise ImportFormatError(f"Unterminated quoted cell on line {record_line}.")
+
+
+def parse_records(fmt: str, chunks: AsyncIterator[bytes]):
+    lines = iter_lines(chunks)
+    return csv_records(lines) if fmt == CSV else ndjson_records(lines)
+
+
+class TaskImporter:
+    """
+    Inserts validated tasks chunk by chunk, one transaction per chunk. Each
+    chunk is a multi-row INSERT for its tasks and one for their subtasks,
+    so a chunk costs a handful of round trips however many rows it holds.
+    Committed chunks stay committed if a later one fails.
+    """
+
+    def __init__(self, conn, cursor, user_id: int) -> None:
+        self.conn = conn
+        self.cursor = cursor
+        self.user_id = user_id
+        self.imported = 0
+        self.failed = 0
+        self.rows = 0
+        self._projects: Set[int] = set()
+        self._columns: Set[int] = set()
+        self._priorities: Set[int] = set()
+
+    async def prepare(self) -> None:
+        result_sets = await execute_batch(self.cursor, [
+            (f"SELECT projectID FROM {DB_NAME}.projects WHERE userID = %s", (self.user_id,)),
+            (f"SELECT priorityID FROM {DB_NAME}.priorities", ()),
+        ])
+        self._projects = {row['projectID'] for row in result_sets[0]}
+        self._priorities = {row['priorityID'] for row in result_sets[1]}
+        self._columns = set(await kanban_columns.get_names(self.cursor))
+        # the lookups opened a transaction, chunks start their own
+        await self.conn.rollback()
+
+    def validate(self, line: int, record) -> Tuple[Optional[TaskCreateSchema], Optional[dict]]:
+        self.rows += 1
+        if isinstance(record, ImportFormatError):
+            return None, self._error(line, str(record))
+        if not isinstance(record, dict):
+            return None, self._error(line, "A row must be an object.")
+        try:
+            task = TaskCreateSchema(**record)
+        except ValidationError as e:
+            return None, self._error(line, json.loads(e.json(include_url=False)))
+
+        if task.projectID not in self._projects:
+            return None, self._error(line, f"Project {task.projectID} not found.")
+        if task.columnID not in self._columns:
+            return None, self._error(line, f"Column {task.columnID} not found.")
+        if task.priorityID not in self._priorities:
+            return None, self._error(line, f"Priority {task.priorityID} not found.")
+        return task, None
+
+    def _error(self, line: int, detail) -> dict:
+        self.failed += 1
+        return {"event": "error", "line": line, "detail": detail}
+
+    async def insert_chunk(self, tasks: List[TaskCreateSchema]) -> None:
+        user_id = self.user_id
+        column_ids = tuple({task.columnID for task in tasks})
+        try:
+            # locks each column's last key, like add_tasks does for one card
+            result_sets = await execute_batch(self.cursor, [
+                *change_log.next_sequence(user_id),
+                (f"""SELECT columnID, MAX(rank_key) AS last_key FROM {DB_NAME}.tasks
+                     WHERE userID = %s AND columnID IN %s
+                     GROUP BY columnID FOR UPDATE""", (user_id, column_ids)),
+            ])
+            last_keys = {row['columnID']: row['last_key'] for row in result_sets[-1]}
+
+            # each column's share of the chunk gets its keys in one go; a
+            # column whose keys would outgrow rank_key is respread first
+            column_keys: Dict[int, List[str]] = {}
+            respread: List[dict] = []
+            for column_id in column_ids:
+                count = sum(1 for task in tasks if task.columnID == column_id)
+                keys, rewritten = await column_append_keys(
+                    self.cursor, user_id, column_id, last_keys.get(column_id), count)
+                column_keys[column_id] = keys[::-1]
+                respread += rewritten
+            rank_keys = [(task.columnID, column_keys[task.columnID].pop()) for task in tasks]
+
+            task_values = [
+                (user_id, task.projectID, task.title, task.description,
+                 json.dumps([tag.model_dump() for tag in task.tags]),
+                 task.start_date, task.end_date, task.columnID, task.priorityID, key)
+                for task, (_, key) in zip(tasks, rank_keys)]
+
+            # the new ids are read back through the (columnID, rank_key) pairs,
+            # unique per user and covered by idx_tasks_user_column_rank
+            result_sets = await execute_batch(self.cursor, [
+                (f"""INSERT INTO {DB_NAME}.tasks (userID, projectID, title, description, tags,
+                         start_date, end_date, columnID, priorityID, rank_key)
+                     VALUES {', '.join(['%s'] * len(task_values))}""", task_values),
+                (f"""SELECT taskID, columnID, rank_key FROM {DB_NAME}.tasks
+                     WHERE userID = %s AND (columnID, rank_key) IN %s""",
+                 (user_id, tuple(rank_keys))),
+            ])
+            task_ids = {(row['columnID'], row['rank_key']): row['taskID']
+                        for row in result_sets[-1]}
+            new_ids = tuple(task_ids[pair] for pair in rank_keys)
+
+            subtask_values = [
+                (user_id, task_id, subtask.title, 0, position)
+                for task, task_id in zip(tasks, new_ids)
+                for position, subtask in enumerate(task.subtasks, start=1)]
+
+            follow_ups = sync_task_tags(user_id, "t.taskID IN %s", (new_ids,))
+            if subtask_values:
+                follow_ups.append(
+                    (f"""INSERT INTO {DB_NAME}.sub_tasks (userID, taskID, title, is_completed, position)
+                         VALUES {', '.join(['%s'] * len(subtask_values))}""", subtask_values))
+                follow_ups.append(change_log.log_changes_from(
+                    user_id, change_log.SUBTASK, change_log.CREATE,
+                    f"""SELECT st.subTaskID AS entityID, t.projectID FROM {DB_NAME}.sub_tasks st
+                        INNER JOIN {DB_NAME}.tasks t ON t.taskID = st.taskID
+                        WHERE st.userID = %s AND st.taskID IN %s""",
+                    (user_id, new_ids)))
+            follow_ups.append(change_log.log_changes_from(
+                user_id, change_log.TASK, change_log.CREATE,
+                f"SELECT taskID AS entityID, projectID FROM {DB_NAME}.tasks WHERE userID = %s AND taskID IN %s",
+                (user_id, new_ids)))
+
+            await execute_batch(self.cursor, follow_ups)
+            await self.conn.commit()
+        except DB_ERRORS:
+            await self.conn.rollback()
+            raise
+
+        self.imported += len(tasks)
+        for project_id in {task.projectID for task in tasks} | {row['projectID'] for row in respread}:
+            await data_version.bump(user_id, project_id)
+        # a whole chunk of cards is cheaper to rebuild than to patch in
+        await board_cache.invalidate(user_id)
+
+    def progress(self, event: str = "progress") -> dict:
+        return {"event": event, "rows": self.rows,
+                "imported": self.imported, "failed": self.failed}
+
+    async def run(self, records) -> AsyncGenerator[str, None]:
+        """
+        Consumes (line, record) pairs and yields NDJSON report lines: one per
+        rejected row, a progress line per committed chunk and a final
+        "done" (or "aborted") line with the totals.
+        """
+        chunk: List[TaskCreateSchema] = []
+        try:
+            await self.prepare()
+            async for line, record in records:
+                task, error = self.validate(line, record)
+                if error is not None:
+                    yield json.dumps(error, default=str) + "\n"
+                    if self.failed >= IMPORT_MAX_ERRORS:
+                        raise ImportFormatError(f"Stopped after {self.failed} rejected rows.")
+                    continue
+
+                chunk.append(task)
+                if len(chunk) >= IMPORT_CHUNK_ROWS:
+                    await self.insert_chunk(chunk)
+                    chunk = []
+                    yield json.dumps(self.progress()) + "\n"
+
+            if chunk:
+                await self.insert_chunk(chunk)
+            yield json.dumps(self.progress("done")) + "\n"
+
+        except ImportFormatError as e:
+            yield json.dumps({**self.progress("aborted"), "detail": str(e)}) + "\n"
+        except DB_ERRORS as e:
+            logger.error(f"Task import for user {self.user_id} failed: {e}")
+            yield json.dumps({**self.progress("aborted"),
+                              "detail": "Stopped by a database error, rows of earlier chunks were imported."}) + "\n"
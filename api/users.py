@@ -72,6 +72,25 @@ class Users():
         except HTTPException:
             return False
 
+    async def get_cached_user_id(self, username: str) -> Optional[int]:
+        async with get_redis_context() as redis_client:
+            c_user_id = await redis_client.get(f"user:{username}:id")
+            logger.info(f'fetching cached user:{username} successful')
+
+        return int(c_user_id) if c_user_id else None
+
+    async def get_session_user_id(self, conn, username: str) -> int:
+        """
+        get_user_id for a lazy session: a cursor, and with it a pool
+        connection, is only taken when the id isn't cached yet.
+        """
+        c_user_id = await self.get_cached_user_id(username)
+        if c_user_id is not None:
+            return c_user_id
+
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            return await self.get_user_id(cursor, username)
+
     async def get_user_id(self, cursor: DictCursor, *args) -> int:
         try:
             # Check if we received the nested tuple structure
@@ -83,13 +102,10 @@ class Users():
 
             REDIS_KEY = f"user:{username}:id"
             logger.debug(f'{username} args {args}')
-            # cached user id
-            async with get_redis_context() as redis_client:
-                c_user_id = await redis_client.get(REDIS_KEY)
-                logger.info(f'fetching cached user:{username} successful')
+            c_user_id = await self.get_cached_user_id(username)
 
-            if c_user_id:
-                return int(c_user_id)
+            if c_user_id is not None:
+                return c_user_id
 
             logger.info('fetching user id from database')
 
@@ -99,7 +115,8 @@ class Users():
             logger.info(f'fetch user record id {user_id} is found in db')
 
 
-            await redis_client.set(REDIS_KEY, user_id)
+            async with get_redis_context() as redis_client:
+                await redis_client.set(REDIS_KEY, user_id)
             logger.info(f'caching user:{username} successful')
             return int(user_id)
 
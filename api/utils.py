@@ -1,17 +1,19 @@
 import logging
 import random
 import re
+import secrets
 import string
 from typing import Annotated, Union
 import redis.asyncio as redis  # type: ignore
 
 from asyncmy.connection import Connection  # type: ignore
 from asyncmy.cursors import DictCursor  # type: ignore
-from fastapi import BackgroundTasks, Cookie, Depends, HTTPException, status
+from fastapi import BackgroundTasks, Cookie, Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import ValidationError
 from pytz import timezone
 from api.auth import verify_token
+from api.config import settings
 from api.db.database import get_session
 from api.db.redis_backend import (
     get_redis)
@@ -110,6 +112,17 @@ async def get_current_user(username: Union[str, None] = None, payload: dict = De
     return token
 
 
+def require_internal_token(x_internal_token: Annotated[Union[str, None], Header()] = None) -> None:
+    """
+    Guards operational endpoints: only callers sending INTERNAL_API_TOKEN in
+    X-Internal-Token get through. Without a configured token they answer 404.
+    """
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected or x_internal_token is None or not secrets.compare_digest(
+            x_internal_token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
 async def get_refresh_token(payload: dict = Depends(TokenVerifier('refresh'))) -> RefreshTokenData:
     t_username = payload.get('sub')
     logger.info(f'getting user {t_username} refresh token')
@@ -1,21 +1,30 @@
 import logging
 import os
 import tracemalloc
+import uuid
 
-from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from mysql.connector import Error
 from api.app_lifespans import master_lifespan
-from api.db.database import get_session
+from api.db import database
+from api.db.database import get_read_session
+from api.db.pool_health import pool_health
+from api.db.pool_metrics import pool_metrics
+from api.db.query_metrics import query_metrics
+from api.db.resilience import DB_ERRORS, circuit_breaker
+from api.board_events import board_events
+from api.data_version import etag_matches
+from api.recommendations import recommendations
 from pytz import timezone
-from asyncmy.cursors import DictCursor  # type: ignore
 from asyncmy.connection import Connection  # type: ignore
 from api.routes.auth_router import auth_router
 from api.routes.projects_router import projects_router
 from api.routes.tasks_router import task_router
 from api.routes.users_router import user_router
 from api.routes.sub_tasks_router import sub_task_router
+from api.utils import require_internal_token
 
 
 logger = logging.getLogger('uvicorn.access')
@@ -38,6 +47,15 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def attach_request_id(request: Request, call_next):
+    # ties slow-query and request logs together
+    request.state.req_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request.state.req_id
+    return response
+
+
 class CacheStaticFiles(StaticFiles):
     def file_response(self, *args, **kwargs) -> Response:
         response = super().file_response(*args, **kwargs)
@@ -60,18 +78,33 @@ app.include_router(sub_task_router)
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy",
+            "database": pool_health.snapshot(),
+            "pool": pool_metrics.snapshot(database.db_pool),
+            "circuit": circuit_breaker.snapshot(),
+            "board_events": board_events.snapshot()}
+
+
+# statement text and per-route timings are for operators only
+@app.get("/api/health/queries", dependencies=[Depends(require_internal_token)])
+async def query_stats():
+    return query_metrics.snapshot()
 
 
 @app.get("/api/recommendations")
-async def getRecommendations(conn: Connection = Depends(get_session)):
+async def getRecommendations(request: Request,
+                             conn: Connection = Depends(get_read_session),
+                             limit: int = Query(15, ge=1, le=100),
+                             offset: int = Query(0, ge=0)):
     try:
-        async with conn.cursor(cursor=DictCursor) as cursor:
-            getRecommendations = """SELECT id, title FROM recommendations ORDER BY id ASC LIMIT %(limit)s OFFSET %(offset)s"""
-            await cursor.execute(getRecommendations, {
-                'limit': 15, 'offset': 0})
-            return await cursor.fetchall()
+        page = await recommendations.get_page(conn, limit=limit, offset=offset)
 
-    except Error as e:
+    except DB_ERRORS as e:
         raise HTTPException(
             status_code=500, detail=f"Something went wrong: {e}")
+
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), page.etag):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(content=page.items, headers=headers)
@@ -0,0 +1,15 @@
+import os
+
+# Settings() is built at import time and has no defaults for these; the
+# pure helpers under test never reach the services they point at.
+for name, value in {
+    "BUILD": "test", "ACCESS_KEY": "test", "REFRESH_KEY": "test",
+    "ACCESS_TOKEN_MAX_AGE": "900", "REFRESH_TOKEN_MAX_AGE": "86400",
+    "REFRESH_TOKEN_COOKIE_NAME": "refresh_token", "REFRESH_TOKEN_DOMAIN": "localhost",
+    "REDIS_URL": "redis://localhost:6379/0", "DB_HOST": "localhost", "DB_NAME": "kanban",
+    "DB_USER": "test", "DB_PASSWORD": "test", "DB_PORT": "3306", "AIVEN_CA_CERT_PATH": "ca.pem",
+    "CLOUDINARY_CLOUD_NAME": "test", "CLOUDINARY_API_KEY": "test", "CLOUDINARY_API_SECRET": "test",
+    "MAIL_USERNAME": "test", "MAIL_PASSWORD": "test", "MAIL_FROM": "test@example.com",
+    "MAIL_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,88 @@
+from api.db.rank import (RANK_KEY_MAX_LENGTH, append_keys, apply_moves,
+                         key_between, spread_keys)
+
+
+def test_thousands_of_appends_stay_short_and_ordered():
+    keys = []
+    last_key = None
+    for _ in range(250_000):
+        last_key = key_between(last_key, None)
+        keys.append(last_key)
+
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    # the old first-digit bump passed the 64 character column at ~2000
+    assert max(len(key) for key in keys[:2000]) <= 3
+    assert max(len(key) for key in keys) <= 6
+
+
+def test_thousands_of_prepends_stay_short_and_ordered():
+    keys = []
+    first_key = None
+    for _ in range(20_000):
+        first_key = key_between(None, first_key)
+        keys.append(first_key)
+
+    assert keys == sorted(keys, reverse=True)
+    assert max(len(key) for key in keys) <= 4
+
+
+def test_append_keys_continue_after_the_last_key():
+    last_key = spread_keys(10)[-1]
+    keys = append_keys(last_key, 5_000)
+
+    assert keys is not None
+    assert keys == sorted(keys)
+    assert keys[0] > last_key
+    assert not any(key.endswith("0") for key in keys)
+
+
+def test_append_keys_ask_for_a_respread_past_the_column_width():
+    assert append_keys("z" * RANK_KEY_MAX_LENGTH, 1) is None
+
+
+def test_moves_to_the_bottom_keep_keys_short():
+    column = [{"taskID": task_id, "columnID": 1, "rank_key": key}
+              for task_id, key in enumerate(spread_keys(3), start=1)]
+    columns = {1: column}
+
+    for _ in range(3_000):
+        top = columns[1][0]["taskID"]
+        apply_moves(columns, [(top, 1, len(columns[1]), None)])
+
+    keys = [row["rank_key"] for row in columns[1]]
+    assert keys == sorted(keys)
+    assert max(len(key) for key in keys) <= RANK_KEY_MAX_LENGTH
+
+
+def _board(*projects):
+    rows = [{"taskID": task_id, "projectID": project_id, "columnID": 1}
+            for task_id, project_id in enumerate(projects, start=1)]
+    for row, key in zip(rows, spread_keys(len(rows))):
+        row["rank_key"] = key
+    return {1: rows, 2: []}
+
+
+def test_new_position_counts_every_card_on_an_unfiltered_board():
+    columns = _board(10, 20, 10, 20)
+    apply_moves(columns, [(4, 1, 1, None)])
+
+    assert [row["taskID"] for row in columns[1]] == [1, 4, 2, 3]
+
+
+def test_new_position_counts_the_projects_cards_on_a_filtered_board():
+    # project 10 shows [1, 3]; dropping card 5 at index 1 puts it before 3
+    columns = _board(10, 20, 10, 20, 10)
+    apply_moves(columns, [(5, 1, 1, 10)])
+
+    assert [row["taskID"] for row in columns[1]] == [1, 2, 5, 3, 4]
+    keys = [row["rank_key"] for row in columns[1]]
+    assert keys == sorted(keys)
+
+
+def test_new_position_past_the_projects_cards_lands_after_its_last_one():
+    columns = _board(10, 20, 10, 20)
+    columns[2].append({"taskID": 9, "projectID": 10, "columnID": 2, "rank_key": "V"})
+    apply_moves(columns, [(9, 1, 5, 10)])
+
+    assert [row["taskID"] for row in columns[1]] == [1, 2, 3, 9, 4]